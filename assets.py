@@ -0,0 +1,357 @@
+# assets.py
+# Pipeline aset yang berjalan saat halaman ditulis: minifikasi HTML/CSS/JS, CSS kritis (above the fold)
+# yang di-inline per template, nama file aset ber-hash (bisa di-cache lama oleh browser/CDN) dan
+# salinan .gz/.br opsional untuk server yang melayani file terkompresi langsung.
+#
+# Minifikasi sengaja konservatif (hanya whitespace dan komentar) supaya tidak pernah mengubah perilaku:
+# isi <pre>, <textarea>, <script> dan <style> di HTML tidak disentuh, dan JS hanya diringkas per baris.
+import os
+import re
+import gzip
+import hashlib
+
+ASSET_DIR = 'assets'
+# Aset statis yang dilayani dengan nama ber-hash (path relatif ke root repo = URL di situs)
+ASSET_SOURCES = ('style.css', 'script/gatau.js', 'script/search.js', 'script/recent-posts.js')
+PRECOMPRESS_FORMATS = ('gz', 'br')
+# Jumlah elemen pertama di <body> (urutan dokumen) yang dianggap terlihat tanpa scroll:
+# header, menu dan beberapa kartu/paragraf pertama.
+CRITICAL_ELEMENT_COUNT = 150
+
+# --- MINIFIKASI CSS ---
+_CSS_TOKEN_RE = re.compile(
+    r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')|(/\*.*?\*/)|(\s+)|([{};,>:()!])|([^"'/\s{};,>:()!]+|[/"'])''',
+    re.S)
+# Spasi di sekitar tanda baca ini tidak bermakna. ':' hanya aman dihapus SETELAHNYA
+# ("a :hover" berbeda dengan "a:hover"), spasi di sekitar '+' dan '-' dibiarkan karena calc().
+_CSS_NO_SPACE_AFTER = frozenset('{};,>:(')
+_CSS_NO_SPACE_BEFORE = frozenset('{};,>)!')
+
+
+def minify_css(css):
+    """Menghapus komentar (kecuali /*! ... */) dan whitespace yang tidak bermakna dari CSS."""
+    out = []
+    pending_space = False
+    for string, comment, space, punct, word in _CSS_TOKEN_RE.findall(css):
+        if space:
+            pending_space = True
+            continue
+        if comment and not comment.startswith('/*!'):
+            continue
+        token = string or comment or punct or word
+        if pending_space and out and out[-1][-1] not in _CSS_NO_SPACE_AFTER and token[0] not in _CSS_NO_SPACE_BEFORE:
+            out.append(' ')
+        pending_space = False
+        if token == '}' and out and out[-1] == ';':
+            out.pop()
+        out.append(token)
+    return ''.join(out)
+
+
+# --- MINIFIKASI JS ---
+def minify_js(js):
+    """
+    Minifikasi per baris: indentasi, baris kosong dan baris yang seluruhnya komentar dihapus.
+    Baris baru dipertahankan (automatic semicolon insertion tetap sama). Tidak untuk file dengan
+    template literal multi-baris.
+    """
+    lines = []
+    in_comment = False
+    for line in js.splitlines():
+        stripped = line.strip()
+        if in_comment:
+            if '*/' not in stripped:
+                continue
+            stripped = stripped.split('*/', 1)[1].strip()
+            in_comment = False
+        if stripped.startswith('/*'):
+            if '*/' not in stripped:
+                in_comment = True
+                continue
+            stripped = stripped.split('*/', 1)[1].strip()
+        if not stripped or stripped.startswith('//'):
+            continue
+        lines.append(stripped)
+    return '\n'.join(lines) + '\n'
+
+
+# --- MINIFIKASI HTML ---
+_HTML_RAW_RE = re.compile(r'(<(pre|textarea|script|style)\b.*?</\2\s*>)|(<!--.*?-->)', re.S | re.I)
+
+
+def _collapse_whitespace(text):
+    text = re.sub(r'\s*\n\s*', '\n', text)
+    return re.sub(r'[ \t\r\f\v]{2,}', ' ', text)
+
+
+def minify_html(html):
+    """
+    Meringkas whitespace di luar <pre>/<textarea>/<script>/<style> (deretan whitespace dengan baris baru
+    menjadi satu baris baru, lainnya menjadi satu spasi) dan menghapus komentar HTML kecuali
+    conditional comment.
+    """
+    out = []
+    # Teks di sekitar komentar yang dihapus digabung dulu, baru whitespace-nya diringkas
+    text = []
+    position = 0
+    for match in _HTML_RAW_RE.finditer(html):
+        text.append(html[position:match.start()])
+        raw, _tag, comment = match.groups()
+        if raw or comment.startswith('<!--[if'):
+            out.append(_collapse_whitespace(''.join(text)))
+            out.append(match.group(0))
+            text = []
+        position = match.end()
+    text.append(html[position:])
+    out.append(_collapse_whitespace(''.join(text)))
+    return ''.join(out).strip() + '\n'
+
+
+# --- CSS KRITIS ---
+def _split_css_blocks(css):
+    """
+    Memecah CSS (sudah diminifikasi) menjadi list (prelude, body) tingkat atas.
+    body None untuk at-rule tanpa blok (misalnya @import atau @charset).
+    """
+    blocks = []
+    position = 0
+    length = len(css)
+    while position < length:
+        prelude_start = position
+        quote = None
+        while position < length:
+            char = css[position]
+            if quote:
+                if char == '\\':
+                    position += 1
+                elif char == quote:
+                    quote = None
+            elif char in '"\'':
+                quote = char
+            elif char in '{;':
+                break
+            position += 1
+        prelude = css[prelude_start:position].strip()
+        if position >= length or css[position] == ';':
+            if prelude:
+                blocks.append((prelude, None))
+            position += 1
+            continue
+        depth = 0
+        body_start = position + 1
+        quote = None
+        while position < length:
+            char = css[position]
+            if quote:
+                if char == '\\':
+                    position += 1
+                elif char == quote:
+                    quote = None
+            elif char in '"\'':
+                quote = char
+            elif char == '{':
+                depth += 1
+            elif char == '}':
+                depth -= 1
+                if depth == 0:
+                    break
+            position += 1
+        blocks.append((prelude, css[body_start:position]))
+        position += 1
+    return blocks
+
+
+def _split_selectors(prelude):
+    selectors, depth, start = [], 0, 0
+    for i, char in enumerate(prelude):
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            selectors.append(prelude[start:i])
+            start = i + 1
+    selectors.append(prelude[start:])
+    return [selector.strip() for selector in selectors if selector.strip()]
+
+
+# Pseudo-class/element yang bergantung pada interaksi atau rendering; dibuang sebelum pencocokan
+# sehingga "a:hover" dianggap cocok jika ada <a> di atas lipatan.
+_DYNAMIC_PSEUDO_RE = re.compile(
+    r'::?(?:hover|focus|focus-within|focus-visible|active|visited|link|target|before|after|first-line|'
+    r'first-letter|selection|placeholder|marker|backdrop|-webkit-[\w-]+|-moz-[\w-]+|-ms-[\w-]+)(?![\w-])')
+
+
+def _selector_matches(soup, selector):
+    selector = _DYNAMIC_PSEUDO_RE.sub('', selector).strip()
+    if not selector or selector[-1] in '>+~':
+        selector = (selector + ' *').strip()
+    try:
+        return soup.select_one(selector) is not None
+    except Exception:
+        # Selector yang tidak dipahami soupsieve tetap dimasukkan (lebih baik berlebih daripada FOUC)
+        return True
+
+
+def _critical_rules(blocks, soup):
+    rules = []
+    for prelude, body in blocks:
+        if body is None:
+            if prelude.lower().startswith('@charset'):
+                continue
+            rules.append(prelude + ';')
+        elif prelude.startswith('@'):
+            name = prelude[1:].split(None, 1)[0].split('(')[0].lower()
+            # @media/@supports berisi rule biasa; @font-face, @keyframes dll. tidak dibutuhkan untuk render awal
+            if name in ('media', 'supports'):
+                inner = _critical_rules(_split_css_blocks(body), soup)
+                if inner:
+                    rules.append(prelude + '{' + ''.join(inner) + '}')
+        elif any(_selector_matches(soup, selector) for selector in _split_selectors(prelude)):
+            rules.append(prelude + '{' + body + '}')
+    return rules
+
+
+def extract_critical_css(css, html, element_count=CRITICAL_ELEMENT_COUNT):
+    """
+    Rule CSS yang mengenai elemen di atas lipatan halaman contoh (element_count elemen pertama di <body>).
+    Urutan rule dipertahankan, jadi cascade-nya sama dengan stylesheet lengkap.
+
+    Args:
+        css (str): Stylesheet lengkap (sebaiknya sudah diminifikasi).
+        html (str): Halaman contoh hasil render template.
+
+    Returns:
+        str: CSS kritis yang siap di-inline di <style>.
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+    body = soup.body or soup
+    # Elemen sesudah batas dibuang dari belakang; induk elemen yang tersisa selalu ada sebelum anaknya
+    for element in reversed(body.find_all(True)[element_count:]):
+        element.decompose()
+    return ''.join(_critical_rules(_split_css_blocks(css), soup))
+
+
+# --- KOMPRESI ---
+def compress(data, fmt):
+    """Salinan terkompresi deterministik (gzip tanpa timestamp) untuk format 'gz' atau 'br'."""
+    if fmt == 'gz':
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    if fmt == 'br':
+        import brotli
+        return brotli.compress(data)
+    raise ValueError(f"Format kompresi tidak dikenal: {fmt}")
+
+
+def parse_precompress(value):
+    """'gz,br' -> ('gz', 'br'). Format 'br' dilewati (dengan peringatan) jika modul brotli tidak terpasang."""
+    formats = []
+    for fmt in (value or '').replace(' ', '').lower().split(','):
+        if not fmt:
+            continue
+        if fmt not in PRECOMPRESS_FORMATS:
+            raise ValueError(f"PRECOMPRESS hanya mendukung {', '.join(PRECOMPRESS_FORMATS)}, bukan '{fmt}'")
+        if fmt == 'br':
+            try:
+                import brotli  # noqa: F401
+            except ImportError:
+                print("PRECOMPRESS=br dilewati: modul 'brotli' tidak terpasang (pip install brotli).")
+                continue
+        formats.append(fmt)
+    return tuple(formats)
+
+
+# --- PIPELINE ---
+class AssetPipeline:
+    """
+    Konfigurasi dan hasil pipeline aset untuk satu build. Objek ini ikut dikirim ke worker render,
+    jadi hanya berisi data biasa (string dan dict).
+
+    Args:
+        source_dir (str): Root repo tempat style.css dan script/ berada.
+        base_url (str): URL situs; referensi absolut ke aset (misalnya di footer) juga diganti.
+        enabled (bool): Minifikasi dan nama aset ber-hash (False = HTML apa adanya).
+        critical_css (bool): Inline CSS kritis per template dan muat stylesheet lengkap secara async.
+        precompress (tuple): Format salinan terkompresi ('gz', 'br') untuk HTML dan aset.
+    """
+
+    def __init__(self, source_dir, base_url, enabled=True, critical_css=True, precompress=()):
+        self.source_dir = source_dir
+        self.base_url = base_url.rstrip('/')
+        self.enabled = enabled
+        self.critical_css_enabled = enabled and critical_css
+        self.precompress = tuple(precompress)
+        # path sumber -> (rel_path ber-hash, isi hasil minifikasi)
+        self.assets = {}
+        # nama template -> CSS kritis
+        self.critical_css = {}
+        self._reference_re = None
+        self._url_map = {}
+
+    def load_assets(self):
+        """Membaca dan meminifikasi aset sumber, lalu menentukan nama ber-hash-nya."""
+        if not self.enabled:
+            return
+        for source in ASSET_SOURCES:
+            path = os.path.join(self.source_dir, source)
+            if not os.path.exists(path):
+                continue
+            with open(path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            text = minify_css(text) if source.endswith('.css') else minify_js(text)
+            data = text.encode('utf-8')
+            stem, ext = os.path.splitext(os.path.basename(source))
+            rel_path = f"{ASSET_DIR}/{stem}.{hashlib.sha1(data).hexdigest()[:10]}{ext}"
+            self.assets[source] = (rel_path, data)
+            for url in (f"/{source}", f"{self.base_url}/{source}"):
+                self._url_map[url] = f"/{rel_path}"
+        if self._url_map:
+            alternatives = '|'.join(re.escape(url) for url in sorted(self._url_map, key=len, reverse=True))
+            self._reference_re = re.compile(r'''(\b(?:href|src)=)(["'])(''' + alternatives + r''')\2''')
+
+    def fingerprint_parts(self):
+        """Input pipeline yang memengaruhi setiap halaman HTML (masuk ke fingerprint global halaman)."""
+        return [self.enabled, self.critical_css_enabled, self.precompress, CRITICAL_ELEMENT_COUNT,
+                sorted(rel_path for rel_path, _ in self.assets.values())]
+
+    def output_files(self):
+        """(rel_path, isi) semua file aset ber-hash, termasuk salinan terkompresinya."""
+        for rel_path, data in self.assets.values():
+            yield rel_path, data
+            for fmt in self.precompress:
+                yield f"{rel_path}.{fmt}", compress(data, fmt)
+
+    @property
+    def stylesheet(self):
+        asset = self.assets.get('style.css')
+        return asset[1].decode('utf-8') if asset else None
+
+    def needs_critical_css(self, template_name):
+        return self.critical_css_enabled and self.stylesheet is not None and template_name not in self.critical_css
+
+    def add_critical_css(self, template_name, sample_html):
+        self.critical_css[template_name] = extract_critical_css(self.stylesheet, sample_html)
+
+    def _rewrite_link(self, match, template_name):
+        tag = match.group(0)
+        reference = self._reference_re.search(tag) if self._reference_re else None
+        if reference is None or not re.search(r'''\brel=["']stylesheet["']''', tag):
+            return tag
+        url = self._url_map[reference.group(3)]
+        critical = self.critical_css.get(template_name)
+        if not self.critical_css_enabled or critical is None:
+            return f'<link rel="stylesheet" href="{url}">'
+        return (f'<style>{critical}</style>'
+                f'<link rel="preload" href="{url}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">'
+                f'<noscript><link rel="stylesheet" href="{url}"></noscript>')
+
+    def process_html(self, html, template_name):
+        """Menerapkan pipeline ke satu halaman hasil render template_name."""
+        if not self.enabled:
+            return html
+        html = re.sub(r'<link\b[^>]*>', lambda match: self._rewrite_link(match, template_name), html)
+        if self._reference_re is not None:
+            html = self._reference_re.sub(lambda m: f"{m.group(1)}{m.group(2)}{self._url_map[m.group(3)]}{m.group(2)}", html)
+        return minify_html(html)
@@ -0,0 +1,72 @@
+# benchmarks/bench_html_processing.py
+# Membandingkan tiga parse BeautifulSoup per postingan (fungsi lama) dengan process_post_html (satu parse).
+#
+# Pemakaian:
+#   python benchmarks/bench_html_processing.py [jumlah_postingan] [posts.json]
+# Jika posts.json diberikan (list postingan mentah Blogger), korpus itu yang dipakai.
+import os
+import sys
+import json
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import (parse_html_content_preview, get_first_image_url,
+                  optimize_blogger_images_in_content, process_post_html)
+
+
+def synthetic_contents(count, seed=1):
+    rng = random.Random(seed)
+    words = ["malam", "rumah", "cerita", "<b>tebal</b>", "&amp;", "&nbsp;", "pergi", "<i>dia</i>", "hantu"]
+    contents = []
+    for i in range(count):
+        parts = []
+        for j in range(rng.randint(5, 40)):
+            parts.append("<p>" + " ".join(rng.choice(words) for _ in range(rng.randint(20, 80))) + "</p>")
+            if rng.random() < 0.3:
+                size = rng.choice(["s1600", "w640-h480", "s72-c"])
+                url = f"https://blogger.googleusercontent.com/img/b/R29v/AVv{i}_{j}/{size}/foto{j}.jpg"
+                parts.append(f'<div class="separator"><a href="{url}"><img border="0" src="{url}" width="640"/></a></div>')
+            if rng.random() < 0.05:
+                parts.append("<script>var x = 1 < 2;</script>")
+        contents.append("\n".join(parts))
+    return contents
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    if len(sys.argv) > 2:
+        with open(sys.argv[2], encoding='utf-8') as f:
+            contents = [p.get('content', '') for p in json.load(f)][:count]
+    else:
+        contents = synthetic_contents(count)
+    total_kb = sum(len(c) for c in contents) / 1024
+    print(f"Korpus: {len(contents)} postingan, {total_kb:.0f} KB HTML")
+
+    start = time.perf_counter()
+    old_results = [
+        (parse_html_content_preview(c, num_words=13), get_first_image_url(c, size='s320'),
+         optimize_blogger_images_in_content(c, default_size='s800'))
+        for c in contents
+    ]
+    old_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    new_results = [
+        process_post_html(c, num_words=13, thumbnail_size='s320', content_image_size='s800')
+        for c in contents
+    ]
+    new_time = time.perf_counter() - start
+
+    mismatches = sum(1 for old, new in zip(old_results, new_results) if old != new)
+    print(f"3x parse (lama)        : {old_time:.2f} s")
+    print(f"process_post_html (baru): {new_time:.2f} s")
+    print(f"Speedup                : {old_time / new_time:.2f}x")
+    print(f"Hasil berbeda          : {mismatches}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
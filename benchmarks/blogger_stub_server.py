@@ -0,0 +1,166 @@
+# benchmarks/blogger_stub_server.py
+# Server HTTP lokal pengganti Blogger API v3 (posts.list) untuk benchmark dan pengujian.
+#
+# Mendukung parameter yang dipakai BloggerClient: maxResults, pageToken, orderBy (published/updated),
+# fetchBodies dan fields (hanya bentuk 'nextPageToken,items(id)'). Korpus sintetis dibuat per halaman
+# saat diminta, jadi korpus 100k postingan tidak perlu ada di memori.
+#
+# error_every=N membuat setiap request ke-N gagal, bergiliran dengan respons di ERROR_RESPONSES
+# (429 dengan Retry-After, 503, 403 rateLimitExceeded), untuk menguji retry dan backoff BloggerClient.
+# error_every=1 membuat semua request gagal (API mati).
+#
+# Pemakaian mandiri:
+#   python benchmarks/blogger_stub_server.py (jumlah_postingan | posts.json) [port] [latensi_ms] [error_every]
+#   BLOGGER_API_BASE=http://127.0.0.1:<port>/blogger/v3 BLOGGER_API_KEY=x BLOG_ID=x python main.py
+import os
+import sys
+import json
+import time
+import threading
+import urllib.parse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic_corpus import generate_post
+from utils import parse_timestamp
+
+
+class SyntheticCorpus:
+    """
+    Korpus sintetis (lihat synthetic_corpus.py). 'published' dan 'updated' naik bersama nomor postingan,
+    jadi urutan orderBy=published dan orderBy=updated sama: nomor terbesar dulu.
+    Menambah count = menerbitkan postingan baru.
+    """
+
+    def __init__(self, count, seed=1):
+        self.count = count
+        self.seed = seed
+
+    def __len__(self):
+        return self.count
+
+    def page(self, start, size, order_by):
+        numbers = range(self.count - 1 - start, max(-1, self.count - 1 - start - size), -1)
+        return [generate_post(number, self.seed) for number in numbers]
+
+
+class ListCorpus:
+    """Korpus dari list postingan (misalnya hasil synthetic_corpus.py atau ekspor asli)."""
+
+    def __init__(self, posts):
+        self.by_published = sorted(posts, key=lambda p: parse_timestamp(p['published']), reverse=True)
+        self.by_updated = sorted(posts, key=lambda p: parse_timestamp(p['updated']), reverse=True)
+
+    def __len__(self):
+        return len(self.by_published)
+
+    def page(self, start, size, order_by):
+        posts = self.by_updated if order_by == 'updated' else self.by_published
+        return posts[start:start + size]
+
+
+# Respons error Google API yang layak dicoba ulang: (status, header, body)
+ERROR_RESPONSES = (
+    (429, {'Retry-After': '0'}, {'error': {'code': 429, 'message': 'Too Many Requests',
+                                           'errors': [{'reason': 'rateLimitExceeded'}]}}),
+    (503, {}, {'error': {'code': 503, 'message': 'Backend Error', 'errors': [{'reason': 'backendError'}]}}),
+    (403, {}, {'error': {'code': 403, 'message': 'Rate Limit Exceeded',
+                         'errors': [{'reason': 'rateLimitExceeded'}]}}),
+)
+
+
+class BloggerStubHandler(BaseHTTPRequestHandler):
+    corpus = None
+    latency = 0.0
+    error_every = 0
+    request_count = 0
+    error_count = 0
+    _lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        url = urllib.parse.urlparse(self.path)
+        if not (url.path.startswith('/blogger/v3/blogs/') and url.path.endswith('/posts')):
+            self.send_error(404)
+            return
+        with self._lock:
+            type(self).request_count += 1
+            request_number = self.request_count
+        if self.latency:
+            time.sleep(self.latency)
+        if self.error_every and request_number % self.error_every == 0:
+            with self._lock:
+                type(self).error_count += 1
+                status, headers, body = ERROR_RESPONSES[(self.error_count - 1) % len(ERROR_RESPONSES)]
+            self._send_json(status, body, headers)
+            return
+
+        query = urllib.parse.parse_qs(url.query)
+        start = int(query.get('pageToken', ['0'])[0])
+        size = min(int(query.get('maxResults', ['10'])[0]), 500)
+        order_by = query.get('orderBy', ['published'])[0]
+        items = self.corpus.page(start, size, order_by)
+        if query.get('fetchBodies', ['true'])[0].lower() == 'false':
+            items = [{k: v for k, v in item.items() if k != 'content'} for item in items]
+        if 'items(id)' in query.get('fields', [''])[0]:
+            items = [{'id': item['id']} for item in items]
+
+        body = {'kind': 'blogger#postList'}
+        if items:
+            body['items'] = items
+        if start + size < len(self.corpus):
+            body['nextPageToken'] = str(start + size)
+        self._send_json(200, body)
+
+    def _send_json(self, status, body, headers=None):
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=UTF-8')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def start_server(corpus, port=0, latency_ms=0, error_every=0):
+    """
+    Menjalankan server di thread background. error_every bisa diubah saat server berjalan lewat
+    server.RequestHandlerClass.error_every.
+
+    Returns:
+        tuple: (server, base_url) - base_url dipakai sebagai BLOGGER_API_BASE.
+    """
+    handler = type('Handler', (BloggerStubHandler,), {'corpus': corpus, 'latency': latency_ms / 1000,
+                                                      'error_every': error_every})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/blogger/v3"
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Pemakaian: python benchmarks/blogger_stub_server.py (jumlah_postingan | posts.json) [port] [latensi_ms] [error_every]")
+        sys.exit(1)
+    if sys.argv[1].endswith('.json'):
+        with open(sys.argv[1], encoding='utf-8') as f:
+            corpus = ListCorpus(json.load(f))
+    else:
+        corpus = SyntheticCorpus(int(sys.argv[1]))
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 8765
+    latency_ms = float(sys.argv[3]) if len(sys.argv) > 3 else 0
+    error_every = int(sys.argv[4]) if len(sys.argv) > 4 else 0
+    server, base_url = start_server(corpus, port, latency_ms, error_every)
+    print(f"Blogger API stand-in ({len(corpus)} postingan) di {base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+# benchmarks/run_benchmarks.py
+# Benchmark build lengkap main.py terhadap korpus sintetis yang disajikan server Blogger API lokal.
+#
+# Untuk setiap ukuran korpus dijalankan empat skenario, masing-masing sebagai proses main.py terpisah:
+#   cold    - output dan post store kosong (unduh semua postingan, render semua halaman)
+#   warm    - build ulang tanpa perubahan
+#   publish - build ulang setelah 10 postingan baru terbit
+#   flaky   - seperti publish, tetapi setiap request API ke-N gagal (429/503/403 rateLimitExceeded) sehingga
+#             retry dan backoff BloggerClient ikut terukur (--error-every, 0 = skenario dilewati)
+# Build yang gagal (exit code bukan 0 atau 'error' di laporan build) tidak dicatat sebagai hasil yang valid.
+# Waktu per tahap diambil dari laporan build (BUILD_REPORT, lihat build_stats.py), ditambah wall time
+# dan peak RSS proses. Hasilnya disimpan sebagai JSON supaya bisa dibandingkan antar commit.
+#
+# Pemakaian:
+#   python benchmarks/run_benchmarks.py [--sizes 1000,10000] [--workers 1] [--latency-ms 0] [--error-every 3]
+#                                       [--output hasil.json] [--compare hasil_lama.json]
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import subprocess
+from datetime import datetime, timezone
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARK_DIR)
+sys.path.insert(0, BENCHMARK_DIR)
+
+from synthetic_corpus import BLOG_ID
+from blogger_stub_server import SyntheticCorpus, start_server
+
+PUBLISH_COUNT = 10
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_build(output_dir, base_url, workers, extra_env=None):
+    """Menjalankan main.py sebagai proses terpisah. Mengembalikan hasil satu run (tanpa korpus/skenario)."""
+    report_path = os.path.join(output_dir, '.build_cache', 'benchmark-report.json')
+    env = dict(os.environ,
+               BLOGGER_API_BASE=base_url,
+               BLOGGER_API_KEY='benchmark',
+               BLOG_ID=BLOG_ID,
+               BUILD_WORKERS=str(workers),
+               BUILD_REPORT=report_path)
+    env.update(extra_env or {})
+    if os.path.exists(report_path):
+        os.remove(report_path)
+
+    start = time.perf_counter()
+    with open(os.path.join(output_dir, 'build.log'), 'w', encoding='utf-8') as log:
+        process = subprocess.Popen([sys.executable, os.path.join(REPO_DIR, 'main.py')],
+                                   cwd=output_dir, env=env, stdout=log, stderr=subprocess.STDOUT)
+        # wait4 memberi rusage proses ini saja (peak RSS termasuk worker render tidak dihitung)
+        _, status, rusage = os.wait4(process.pid, 0)
+    wall_seconds = time.perf_counter() - start
+    process.returncode = os.waitstatus_to_exitcode(status)
+
+    report = None
+    if os.path.exists(report_path):
+        with open(report_path, encoding='utf-8') as f:
+            report = json.load(f)
+    # ru_maxrss dalam KB di Linux, dalam byte di macOS
+    max_rss_mb = rusage.ru_maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+    error = None
+    if process.returncode != 0 or report is None or report.get('error'):
+        error = (report or {}).get('error') or f"exit code {process.returncode}"
+    return {
+        'exit_code': process.returncode,
+        'error': error,
+        'wall_seconds': round(wall_seconds, 3),
+        'max_rss_mb': round(max_rss_mb, 1),
+        'api_retries': ((report or {}).get('counts') or {}).get('api_retries'),
+        'report': report,
+    }
+
+
+def run_size(size, args):
+    corpus = SyntheticCorpus(size, seed=args.seed)
+    server, base_url = start_server(corpus, latency_ms=args.latency_ms)
+    output_dir = tempfile.mkdtemp(prefix=f'blogger-bench-{size}-')
+    runs = []
+    try:
+        scenarios = ('cold', 'warm', 'publish') + (('flaky',) if args.error_every else ())
+        for scenario in scenarios:
+            if scenario in ('publish', 'flaky'):
+                corpus.count += PUBLISH_COUNT
+            if scenario == 'flaky':
+                server.RequestHandlerClass.error_every = args.error_every
+            result = run_build(output_dir, base_url, args.workers)
+            result.update(posts=len(corpus), scenario=scenario)
+            runs.append(result)
+            stages = (result['report'] or {}).get('stages', {})
+            stage_summary = ", ".join(f"{name} {entry['wall_seconds']:.2f}s" for name, entry in stages.items())
+            retry_summary = f", {result['api_retries']} retry API" if scenario == 'flaky' else ''
+            print(f"{size:>7} {scenario:<8} {result['wall_seconds']:>8.2f}s {result['max_rss_mb']:>7.1f} MB  {stage_summary}{retry_summary}")
+            if result['error']:
+                print(f"        build gagal ({result['error']}), lihat {os.path.join(output_dir, 'build.log')}")
+                args.keep = True
+                break
+    finally:
+        server.shutdown()
+        if args.keep:
+            print(f"        output disimpan di {output_dir}")
+        else:
+            shutil.rmtree(output_dir, ignore_errors=True)
+    return runs
+
+
+def compare(results, baseline_path):
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    baseline_runs = {(run['posts'], run['scenario']): run for run in baseline['runs']}
+    print(f"\nPerbandingan dengan {baseline_path} (commit {baseline.get('commit')}):")
+    for run in results['runs']:
+        old = baseline_runs.get((run['posts'], run['scenario']))
+        if old is None or run.get('error') or old.get('error'):
+            continue
+        print(f"{run['posts']:>7} {run['scenario']:<8} {old['wall_seconds']:>8.2f}s -> {run['wall_seconds']:>8.2f}s "
+              f"({run['wall_seconds'] / old['wall_seconds']:.2f}x), RSS {old['max_rss_mb']:.0f} -> {run['max_rss_mb']:.0f} MB")
+        old_stages = (old.get('report') or {}).get('stages', {})
+        for name, entry in ((run.get('report') or {}).get('stages', {})).items():
+            if name in old_stages and old_stages[name]['wall_seconds'] > 0:
+                ratio = entry['wall_seconds'] / old_stages[name]['wall_seconds']
+                print(f"{'':>17}{name:<14} {old_stages[name]['wall_seconds']:>8.2f}s -> {entry['wall_seconds']:>8.2f}s ({ratio:.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark build main.py dengan korpus Blogger sintetis.")
+    parser.add_argument('--sizes', default='1000,5000',
+                        help="Ukuran korpus, dipisah koma (misalnya 1000,10000,100000)")
+    parser.add_argument('--workers', type=int, default=1, help="BUILD_WORKERS untuk main.py (0 = satu per core)")
+    parser.add_argument('--latency-ms', type=float, default=0, help="Latensi buatan per request API")
+    parser.add_argument('--error-every', type=int, default=3,
+                        help="Skenario flaky: setiap request API ke-N gagal (0 = tanpa skenario flaky)")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help="File hasil JSON (default: benchmarks/results/<commit>-<waktu>.json)")
+    parser.add_argument('--compare', help="File hasil JSON lama untuk dibandingkan")
+    parser.add_argument('--keep', action='store_true', help="Jangan hapus folder output build")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    results = {
+        'commit': commit,
+        'created': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'settings': {'workers': args.workers, 'latency_ms': args.latency_ms, 'seed': args.seed,
+                     'publish_count': PUBLISH_COUNT, 'error_every': args.error_every},
+        'runs': [],
+    }
+    print(f"{'posts':>7} {'skenario':<8} {'wall':>9} {'peak RSS':>10}  tahap")
+    for size in (int(value) for value in args.sizes.split(',')):
+        results['runs'].extend(run_size(size, args))
+
+    output_path = args.output or os.path.join(
+        BENCHMARK_DIR, 'results', f"{commit or 'unknown'}-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nHasil disimpan di {output_path}")
+
+    if args.compare:
+        compare(results, args.compare)
+    if any(run['error'] for run in results['runs']):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
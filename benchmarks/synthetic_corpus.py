@@ -0,0 +1,132 @@
+# benchmarks/synthetic_corpus.py
+# Korpus postingan Blogger sintetis untuk benchmark (1k - 100k postingan).
+#
+# Setiap postingan dibuat deterministik dari (seed, nomor postingan), jadi postingan ke-i bisa dibuat
+# kapan saja tanpa menyimpan seluruh korpus di memori (dipakai blogger_stub_server.py).
+# Postingan ke-i terbit setelah postingan ke-(i-1), jadi urutan "terbaru dulu" = nomor menurun.
+#
+# Pemakaian:
+#   python benchmarks/synthetic_corpus.py jumlah_postingan output.json [seed]
+import sys
+import json
+import random
+from datetime import datetime, timedelta, timezone
+
+BLOG_ID = "1000000000000000000"
+START_DATE = datetime(2015, 1, 1, tzinfo=timezone.utc)
+# Label dengan distribusi Zipf: beberapa label sangat populer, banyak label jarang dipakai
+LABELS = ["Cerita Horor", "Misteri", "Kisah Nyata", "Urban Legend", "Cerita Lucu", "Motivasi",
+          "Tips & Trik", "Sejarah", "Legenda", "Cerpen"] + [f"Topik {i}" for i in range(1, 71)]
+LABEL_WEIGHTS = [1 / (rank + 1) for rank in range(len(LABELS))]
+WORDS = ("malam rumah tua pintu jendela suara langkah kaki bayangan hujan angin pohon jalan desa kota "
+         "teman keluarga ibu ayah nenek sekolah kantor cerita hantu misteri tiba-tiba pelan gelap terang "
+         "akhirnya kemudian sejak itu dia mereka kami tidak pernah selalu mungkin benar").split()
+IMAGE_SIZES = ("s1600", "s640", "w640-h480", "s320", "s72-c", "w1200-h630-p-k-no-nu")
+TIMEZONES = ("Z", "+07:00")
+
+
+def _sentence(rng, min_words=6, max_words=24):
+    words = [rng.choice(WORDS) for _ in range(rng.randint(min_words, max_words))]
+    words[0] = words[0].capitalize()
+    # Sesekali ada format inline dan entity HTML
+    if rng.random() < 0.2:
+        i = rng.randrange(len(words))
+        words[i] = f"<b>{words[i]}</b>"
+    if rng.random() < 0.1:
+        words.append("&amp;")
+    return " ".join(words) + "."
+
+
+def _image(rng, post_number, image_number):
+    size = rng.choice(IMAGE_SIZES)
+    url = f"https://blogger.googleusercontent.com/img/b/R29vZ2xl/AVvXsE{post_number}x{image_number}/{size}/gambar-{image_number}.jpg"
+    alt = rng.choice(("", ' alt=""', f' alt="Ilustrasi {image_number}"'))
+    return (f'<div class="separator" style="clear: both; text-align: center;">'
+            f'<a href="{url}" style="margin-left: 1em; margin-right: 1em;">'
+            f'<img border="0" data-original-height="1080" data-original-width="1920" height="360" src="{url}"{alt} width="640" />'
+            f'</a></div>')
+
+
+def _content(rng, post_number):
+    parts = []
+    image_number = 0
+    # Panjang postingan bervariasi (sebagian besar pendek, sebagian panjang)
+    for paragraph in range(int(rng.lognormvariate(2.0, 0.6)) + 2):
+        if paragraph and rng.random() < 0.15:
+            parts.append(f"<h3>{_sentence(rng, 2, 6)}</h3>")
+        parts.append("<p>" + " ".join(_sentence(rng) for _ in range(rng.randint(1, 6))) + "</p>")
+        if rng.random() < 0.35:
+            parts.append(_image(rng, post_number, image_number))
+            image_number += 1
+        if rng.random() < 0.05:
+            parts.append('<p><a href="https://www.example.com/sumber">Sumber</a></p>')
+        if rng.random() < 0.02:
+            parts.append("<script>var adsbygoogle = window.adsbygoogle || [];</script>")
+        if rng.random() < 0.02:
+            parts.append('<iframe width="560" height="315" src="https://www.youtube.com/embed/abc" allowfullscreen></iframe>')
+    return "\n".join(parts)
+
+
+def _timestamp(value, rng):
+    if rng.choice(TIMEZONES) == "Z":
+        return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+    return value.astimezone(timezone(timedelta(hours=7))).strftime("%Y-%m-%dT%H:%M:%S+07:00")
+
+
+def generate_post(number, seed=1):
+    """Postingan ke-number (mulai 0) dalam format item posts.list Blogger API."""
+    rng = random.Random(seed * 1000003 + number)
+    published = START_DATE + timedelta(hours=number * 3, minutes=rng.randint(0, 170))
+    # 'updated' selalu setelah 'published' dan tetap berurutan menurut nomor postingan
+    updated = published + timedelta(minutes=rng.randint(1, 9))
+    label_count = min(len(LABELS), int(rng.expovariate(0.7)))
+    labels = []
+    while len(labels) < label_count:
+        label = rng.choices(LABELS, weights=LABEL_WEIGHTS)[0]
+        if label not in labels:
+            labels.append(label)
+    # Sebagian judul sengaja sama (menghasilkan slug yang bentrok, seperti blog sungguhan)
+    title = _sentence(rng, 3, 9).rstrip(".") if rng.random() > 0.01 else "Cerita Tanpa Judul"
+    post_id = str(7000000000000000000 + number)
+    post = {
+        "kind": "blogger#post",
+        "id": post_id,
+        "blog": {"id": BLOG_ID},
+        "published": _timestamp(published, rng),
+        "updated": _timestamp(updated, rng),
+        "url": f"http://contoh.blogspot.com/{published:%Y/%m}/post-{number}.html",
+        "selfLink": f"https://www.googleapis.com/blogger/v3/blogs/{BLOG_ID}/posts/{post_id}",
+        "title": title,
+        "content": _content(rng, number),
+        "author": {"id": "1", "displayName": "Admin", "url": "https://www.blogger.com/profile/1"},
+        "replies": {"totalItems": str(rng.randint(0, 20))},
+    }
+    if labels:
+        post["labels"] = labels
+    return post
+
+
+def iter_posts(count, seed=1):
+    """Semua postingan korpus, terbaru dulu (urutan default posts.list)."""
+    for number in range(count - 1, -1, -1):
+        yield generate_post(number, seed)
+
+
+def main():
+    if len(sys.argv) < 3:
+        print("Pemakaian: python benchmarks/synthetic_corpus.py jumlah_postingan output.json [seed]")
+        sys.exit(1)
+    count = int(sys.argv[1])
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+    with open(sys.argv[2], 'w', encoding='utf-8') as f:
+        f.write("[")
+        for i, post in enumerate(iter_posts(count, seed)):
+            if i:
+                f.write(",\n")
+            json.dump(post, f, ensure_ascii=False)
+        f.write("]\n")
+    print(f"{count} postingan ditulis ke {sys.argv[2]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+# blogger_client.py
+# Klien Blogger API v3: satu session keep-alive, timeout, retry dengan backoff untuk 429/5xx,
+# pencatatan pemakaian kuota, dan generator postingan yang mengunduh halaman berikutnya
+# di background selagi halaman sekarang diproses.
+import time
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+BLOGGER_API_BASE = "https://www.googleapis.com/blogger/v3"
+
+# Status HTTP yang layak dicoba ulang (rate limit dan error sementara di sisi server)
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+# Alasan error 403 dari Google API yang berarti "terlalu cepat", bukan "tidak boleh"
+RETRY_403_REASONS = {'rateLimitExceeded', 'userRateLimitExceeded'}
+
+
+class BloggerAPIError(Exception):
+    """Request ke Blogger API gagal (setelah semua retry), atau batas kuota build tercapai."""
+
+
+class BloggerClient:
+    """
+    Klien posts.list Blogger API.
+
+    Args:
+        api_key (str): API key Blogger.
+        base_url (str): URL dasar API (bisa diarahkan ke server lokal untuk pengujian).
+        timeout (float): Timeout per request (detik).
+        max_retries (int): Jumlah retry maksimal per request.
+        backoff (float): Jeda awal retry (detik); berlipat dua setiap percobaan, dengan jitter.
+        max_backoff (float): Jeda retry maksimal (detik).
+        quota_limit (int): Jumlah request maksimal dalam satu build (0 = tanpa batas).
+                           posts.list memakai 1 unit kuota per request.
+    """
+
+    def __init__(self, api_key, base_url=BLOGGER_API_BASE, timeout=30, max_retries=5,
+                 backoff=1.0, max_backoff=60.0, quota_limit=0, session=None):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.quota_limit = quota_limit
+        self.request_count = 0
+        self.retry_count = 0
+        if session is None:
+            # requests baru di-import saat client dibuat, supaya build OFFLINE tidak membayar waktu import-nya
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            # Koneksi dipakai ulang antar halaman (keep-alive); pool cukup untuk prefetch
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+        self.session = session
+
+    def close(self):
+        self.session.close()
+
+    def summary(self):
+        return f"{self.request_count} request ({self.retry_count} retry)"
+
+    def list_posts(self, blog_id, max_results=10, page_token=None, order_by=None, fetch_bodies=True, fields=None):
+        """
+        Satu halaman posts.list. order_by ('published' atau 'updated') dan fields (partial response)
+        hanya dikirim jika diisi.
+
+        Returns:
+            dict: Respons JSON API.
+
+        Raises:
+            BloggerAPIError: Jika request tetap gagal setelah semua retry.
+        """
+        params = {
+            'key': self.api_key,
+            'fetchBodies': fetch_bodies,
+            'maxResults': max_results,
+        }
+        if order_by:
+            params['orderBy'] = order_by
+        if fields:
+            params['fields'] = fields
+        if page_token:
+            params['pageToken'] = page_token
+        return self._get(f"{self.base_url}/blogs/{blog_id}/posts", params)
+
+    def _get(self, url, params):
+        import requests
+
+        for attempt in range(self.max_retries + 1):
+            if self.quota_limit and self.request_count >= self.quota_limit:
+                raise BloggerAPIError(f"Batas kuota build tercapai ({self.quota_limit} request).")
+            self.request_count += 1
+            retry_after = None
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                error = self._redact(str(e))
+            except requests.exceptions.RequestException as e:
+                raise BloggerAPIError(f"Error fetching Blogger posts: {self._redact(str(e))}") from e
+            else:
+                if response.ok:
+                    try:
+                        return response.json()
+                    except ValueError as e:
+                        raise BloggerAPIError(f"Respons Blogger API bukan JSON valid: {e}") from e
+                error = f"HTTP {response.status_code}: {response.text[:200]}"
+                if not self._is_retryable(response):
+                    raise BloggerAPIError(f"Error fetching Blogger posts: {error}")
+                retry_after = self._retry_after(response)
+
+            if attempt == self.max_retries:
+                raise BloggerAPIError(f"Error fetching Blogger posts setelah {attempt + 1} percobaan: {error}")
+            if retry_after is None:
+                retry_after = min(self.max_backoff, self.backoff * 2 ** attempt) * random.uniform(0.5, 1.0)
+            self.retry_count += 1
+            print(f"Request Blogger API gagal ({error.splitlines()[0][:120]}), mencoba lagi dalam {retry_after:.1f} detik...")
+            time.sleep(retry_after)
+
+    def _redact(self, message):
+        # Pesan error requests memuat URL lengkap, termasuk API key; jangan sampai masuk log CI
+        return message.replace(self.api_key, '***') if self.api_key else message
+
+    @staticmethod
+    def _is_retryable(response):
+        if response.status_code in RETRY_STATUS_CODES:
+            return True
+        if response.status_code == 403:
+            try:
+                errors = response.json().get('error', {}).get('errors', [])
+            except ValueError:
+                return False
+            return any(e.get('reason') in RETRY_403_REASONS for e in errors)
+        return False
+
+    def _retry_after(self, response):
+        value = response.headers.get('Retry-After')
+        if value and value.isdigit():
+            return min(self.max_backoff, float(value))
+        return None
+
+    def iter_pages(self, blog_id, prefetch=True, **params):
+        """
+        Generator halaman posts.list sampai habis. Dengan prefetch, halaman berikutnya sudah diunduh
+        di thread background selagi pemanggil memproses halaman sekarang.
+
+        Raises:
+            BloggerAPIError: Jika salah satu halaman gagal diambil. Pemanggil tidak boleh
+                             memperlakukan halaman yang sudah diterima sebagai data lengkap.
+        """
+        params.pop('page_token', None)
+        if not prefetch:
+            page_token = None
+            while True:
+                page = self.list_posts(blog_id, page_token=page_token, **params)
+                yield page
+                page_token = page.get('nextPageToken')
+                if not page_token:
+                    return
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(self.list_posts, blog_id, **params)
+            try:
+                while future is not None:
+                    page = future.result()
+                    page_token = page.get('nextPageToken')
+                    future = executor.submit(self.list_posts, blog_id, page_token=page_token, **params) if page_token else None
+                    yield page
+            finally:
+                if future is not None:
+                    future.cancel()
+
+    def iter_posts(self, blog_id, prefetch=True, **params):
+        """Generator item postingan dari semua halaman posts.list (lihat iter_pages)."""
+        for page in self.iter_pages(blog_id, prefetch=prefetch, **params):
+            yield from page.get('items', [])
@@ -0,0 +1,198 @@
+# build_stats.py
+# Instrumentasi build: waktu (wall dan CPU), memori dan jumlah item per tahap, histogram waktu render
+# per template dan item paling lambat. Jika BUILD_REPORT diisi, hasilnya ditulis sebagai JSON
+# (dipakai benchmarks/run_benchmarks.py untuk membandingkan performa antar commit).
+#
+# BUILD_PROFILE=render,process (atau 'all') menjalankan cProfile dan tracemalloc pada tahap tersebut
+# dan menulis profilnya ke BUILD_PROFILE_DIR (default .build_cache/profile):
+#   <tahap>.prof            - data cProfile (buka dengan pstats, snakeviz, dsb.)
+#   <tahap>.txt             - 40 fungsi teratas menurut waktu kumulatif
+#   <tahap>.tracemalloc.txt - 25 baris kode dengan alokasi memori terbesar di akhir tahap
+# Profil hanya mencakup proses utama; dengan BUILD_WORKERS > 1 render terjadi di proses worker.
+# Mode profil memperlambat build secara signifikan, jadi jangan dipakai untuk mengukur waktu.
+import os
+import io
+import sys
+import json
+import time
+import heapq
+import bisect
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Batas atas (milidetik) bucket histogram waktu render; bucket terakhir menampung sisanya
+RENDER_HISTOGRAM_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+SLOWEST_ITEMS = 10
+
+
+def peak_rss_mb():
+    """Peak RSS proses ini sejauh ini (MB), atau None jika tidak tersedia di platform ini."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss dalam KB di Linux, dalam byte di macOS
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+HISTOGRAM_BUCKETS = tuple(f"<={limit}ms" for limit in RENDER_HISTOGRAM_MS) + (f">{RENDER_HISTOGRAM_MS[-1]}ms",)
+
+
+def _histogram_bucket(seconds):
+    milliseconds = seconds * 1000
+    return HISTOGRAM_BUCKETS[bisect.bisect_left(RENDER_HISTOGRAM_MS, milliseconds)]
+
+
+class BuildStats:
+    """
+    Timer tahap build yang berurutan: begin('x') menutup tahap sebelumnya lalu memulai tahap 'x',
+    sehingga main() cukup menandai awal setiap tahap tanpa membungkus blok kodenya.
+    Bagian yang lebih kecil di dalam tahap diukur dengan measure('nama').
+
+    Args:
+        profile (str): Tahap yang diprofilkan, dipisah koma, atau 'all' (None/'' = tanpa profil).
+        profile_dir (str): Folder tujuan file profil.
+    """
+
+    def __init__(self, profile=None, profile_dir=os.path.join('.build_cache', 'profile')):
+        self.stages = {}
+        self.timers = {}
+        self.counts = {}
+        # Waktu render per template (jumlah waktu semua worker, bisa lebih besar dari wall time)
+        self.render = {}
+        # Per kategori ('process', 'render'): min-heap (detik, nama) berisi item paling lambat
+        self._slowest = {}
+        # Pesan error jika build gagal (laporan build gagal tidak boleh dibaca sebagai hasil yang valid)
+        self.error = None
+        self._current = None
+        self._stage_start = None
+        self._build_start = time.perf_counter()
+        self._build_cpu_start = time.process_time()
+
+        profile = (profile or '').strip()
+        self.profile_stages = {name.strip() for name in profile.split(',') if name.strip()}
+        self.profile_dir = profile_dir
+        self._profiler = None
+
+    # --- TAHAP ---
+    def begin(self, name):
+        self.end()
+        self._current = name
+        if self._profiling(name):
+            self._start_profile()
+        self._stage_start = (time.perf_counter(), time.process_time())
+
+    def end(self):
+        if self._current is None:
+            return
+        entry = self.stages.setdefault(self._current, {'wall_seconds': 0.0, 'cpu_seconds': 0.0})
+        self._add_time(entry, self._stage_start)
+        # Peak RSS tidak pernah turun; kenaikannya antar tahap menunjukkan tahap mana yang menambah memori
+        entry['peak_rss_mb'] = peak_rss_mb()
+        if self._profiler is not None:
+            entry['tracemalloc_peak_mb'] = self._stop_profile(self._current)
+        self._current = None
+
+    @contextmanager
+    def measure(self, name):
+        """Mengukur blok kode di dalam sebuah tahap (misalnya satu jenis sitemap)."""
+        start = (time.perf_counter(), time.process_time())
+        try:
+            yield
+        finally:
+            self._add_time(self.timers.setdefault(name, {'wall_seconds': 0.0, 'cpu_seconds': 0.0}), start)
+
+    @staticmethod
+    def _add_time(entry, start):
+        entry['wall_seconds'] += time.perf_counter() - start[0]
+        entry['cpu_seconds'] += time.process_time() - start[1]
+
+    # --- JUMLAH ITEM DAN WAKTU PER ITEM ---
+    def count(self, name, value):
+        self.counts[name] = value
+
+    def add_render_time(self, template_name, seconds):
+        entry = self.render.setdefault(template_name, {'pages': 0, 'seconds': 0.0, 'max_seconds': 0.0,
+                                                       'histogram': dict.fromkeys(HISTOGRAM_BUCKETS, 0)})
+        entry['pages'] += 1
+        entry['seconds'] += seconds
+        entry['max_seconds'] = max(entry['max_seconds'], seconds)
+        bucket = _histogram_bucket(seconds)
+        entry['histogram'][bucket] += 1
+
+    def record_item(self, category, name, seconds):
+        """Mencatat waktu satu item; hanya SLOWEST_ITEMS item paling lambat per kategori yang disimpan."""
+        heap = self._slowest.setdefault(category, [])
+        if len(heap) < SLOWEST_ITEMS:
+            heapq.heappush(heap, (seconds, name))
+        elif seconds > heap[0][0]:
+            heapq.heapreplace(heap, (seconds, name))
+
+    # --- PROFIL (opt-in) ---
+    def _profiling(self, name):
+        return 'all' in self.profile_stages or name in self.profile_stages
+
+    def _start_profile(self):
+        import cProfile
+        import tracemalloc
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        self._profiler = cProfile.Profile()
+        self._profiler.enable()
+
+    def _stop_profile(self, name):
+        import pstats
+        import tracemalloc
+
+        self._profiler.disable()
+        # Snapshot diambil sebelum pstats berjalan supaya alokasinya tidak ikut tercatat
+        peak = tracemalloc.get_traced_memory()[1]
+        top_allocations = tracemalloc.take_snapshot().statistics('lineno')[:25]
+
+        os.makedirs(self.profile_dir, exist_ok=True)
+        base_path = os.path.join(self.profile_dir, name)
+        self._profiler.dump_stats(base_path + '.prof')
+        summary = io.StringIO()
+        pstats.Stats(self._profiler, stream=summary).sort_stats('cumulative').print_stats(40)
+        with open(base_path + '.txt', 'w', encoding='utf-8') as f:
+            f.write(summary.getvalue())
+        self._profiler = None
+
+        with open(base_path + '.tracemalloc.txt', 'w', encoding='utf-8') as f:
+            f.write(f"Peak tracemalloc tahap {name}: {peak / (1024 * 1024):.1f} MB\n\n")
+            f.writelines(f"{stat}\n" for stat in top_allocations)
+        return round(peak / (1024 * 1024), 1)
+
+    # --- LAPORAN ---
+    def report(self):
+        self.end()
+        report = {
+            'total_wall_seconds': time.perf_counter() - self._build_start,
+            'total_cpu_seconds': time.process_time() - self._build_cpu_start,
+            'peak_rss_mb': peak_rss_mb(),
+            'stages': self.stages,
+            'timers': self.timers,
+            'counts': self.counts,
+            'render': self.render,
+            'slowest': {category: [{'name': name, 'seconds': seconds}
+                                   for seconds, name in sorted(heap, reverse=True)]
+                        for category, heap in self._slowest.items()},
+        }
+        if self.error is not None:
+            report['error'] = self.error
+        if self.profile_stages:
+            report['profile_dir'] = os.path.abspath(self.profile_dir)
+        return report
+
+    def save(self, path):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2)
+        os.replace(tmp_path, path)
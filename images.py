@@ -0,0 +1,149 @@
+# images.py
+# Markup gambar responsif untuk gambar yang di-host Blogger.
+# URL gambar Blogger memuat segmen ukuran (misalnya /s1600/ atau /w640-h480/) yang bisa diganti ke ukuran
+# mana pun, jadi srcset, width dan height dihitung langsung dari URL dan atribut HTML-nya tanpa mengunduh
+# gambar saat build.
+import re
+import json
+
+# Pola segmen ukuran pada URL gambar Blogger, misalnya /s1600/ atau /w640-h480/
+BLOGGER_IMAGE_SIZE_RE = re.compile(r'/(s\d+|w\d+-h\d+)/')
+_SIZE_SEGMENT_RE = re.compile(r'^(?:s(\d+)|w(\d+)-h(\d+))$')
+
+# Profil gambar per tempat gambar ditampilkan. Template memilih profil lewat image_attrs(url, 'nama_profil'),
+# isi postingan memakai profil 'content'. Bisa diubah lewat IMAGE_PROFILES (JSON, digabung per profil).
+#   widths   - lebar kandidat srcset (hanya yang tidak melebihi lebar asli gambar)
+#   src      - lebar untuk src (browser tanpa dukungan srcset)
+#   sizes    - atribut sizes: lebar tampil gambar di layout
+#   eager    - jumlah gambar pertama yang dimuat eager (yang pertama juga mendapat fetchpriority="high")
+DEFAULT_IMAGE_PROFILES = {
+    # Isi postingan (single_post_template.html); kolom postingan maksimal ~700px
+    'content': {'widths': [320, 480, 640, 800, 1200, 1600], 'src': 800,
+                'sizes': '(max-width: 800px) 100vw, 700px', 'eager': 1},
+    # Thumbnail kartu di index_template.html dan category_detail_template.html (kotak 16:9, 39% kolom)
+    'thumbnail': {'widths': [160, 320, 480, 640], 'src': 320,
+                  'sizes': '(max-width: 280px) 100vw, (max-width: 800px) 39vw, 270px', 'eager': 2},
+    # Thumbnail related posts di single_post_template.html (4 kolom, 2 kolom di layar kecil)
+    'related': {'widths': [192, 384], 'src': 192,
+                'sizes': '(max-width: 320px) 100vw, (max-width: 480px) 48vw, 170px', 'eager': 0},
+}
+
+
+def load_image_profiles(overrides=None):
+    """
+    Profil gambar default digabung dengan overrides.
+
+    Args:
+        overrides (str | dict): JSON atau dict {nama_profil: {field: nilai}}, misalnya
+                                '{"content": {"widths": [480, 800], "eager": 0}}'.
+    """
+    if isinstance(overrides, str):
+        overrides = json.loads(overrides) if overrides.strip() else {}
+    profiles = {name: dict(profile) for name, profile in DEFAULT_IMAGE_PROFILES.items()}
+    for name, values in (overrides or {}).items():
+        profiles[name] = dict(profiles.get(name, DEFAULT_IMAGE_PROFILES['content']), **values)
+    return profiles
+
+
+def _int_attr(value):
+    try:
+        return int(str(value).strip().rstrip('px'))
+    except (TypeError, ValueError):
+        return None
+
+
+def blogger_image_size(url):
+    """
+    Ukuran yang diminta segmen URL Blogger: (lebar, tinggi) untuk wNNN-hNNN, (sisi_terpanjang, None)
+    untuk sNNN, atau None jika URL bukan gambar Blogger yang bisa diubah ukurannya.
+    """
+    match = BLOGGER_IMAGE_SIZE_RE.search(url or '')
+    if not match:
+        return None
+    s_size, width, height = _SIZE_SEGMENT_RE.match(match.group(1)).groups()
+    return (int(s_size), None) if s_size else (int(width), int(height))
+
+
+def blogger_image_url(url, width, aspect=None):
+    """URL gambar Blogger selebar width: w{lebar}-h{tinggi} jika rasio diketahui, selain itu s{lebar}."""
+    segment = f"w{width}-h{round(width / aspect)}" if aspect else f"s{width}"
+    return BLOGGER_IMAGE_SIZE_RE.sub(f'/{segment}/', url, count=1)
+
+
+def image_dimensions(url, attrs=None):
+    """
+    Ukuran asli gambar (lebar, rasio lebar/tinggi); tiap nilai bisa None.
+    Urutan sumber: data-original-width/height (ditulis editor Blogger), segmen wNNN-hNNN di URL,
+    lalu atribut width/height.
+    """
+    attrs = attrs or {}
+    width = _int_attr(attrs.get('data-original-width'))
+    height = _int_attr(attrs.get('data-original-height'))
+    if width and height:
+        return width, width / height
+    url_size = blogger_image_size(url)
+    if url_size and url_size[1]:
+        return url_size[0], url_size[0] / url_size[1]
+    display_width, display_height = _int_attr(attrs.get('width')), _int_attr(attrs.get('height'))
+    aspect = display_width / display_height if display_width and display_height else None
+    # sNNN membatasi sisi terpanjang; untuk gambar landscape (rasio >= 1) itu adalah lebarnya
+    if url_size and (aspect is None or aspect >= 1):
+        return url_size[0], aspect
+    return None, aspect
+
+
+def responsive_attrs(url, profile, index=None, attrs=None):
+    """
+    Atribut <img> responsif untuk satu gambar (dict, berurutan).
+
+    Args:
+        url (str): src asli gambar.
+        profile (dict): Profil gambar (lihat DEFAULT_IMAGE_PROFILES).
+        index (int): Posisi gambar di halaman/daftar (0 = pertama), menentukan eager/lazy.
+        attrs (dict): Atribut <img> yang sudah ada (width/height dari editor dipertahankan).
+
+    Returns:
+        dict: src, srcset, sizes, width, height, loading, decoding dan fetchpriority (jika relevan).
+              srcset/sizes hanya ada untuk URL Blogger yang bisa diubah ukurannya.
+    """
+    attrs = attrs or {}
+    result = {'src': url}
+    original_width, aspect = image_dimensions(url, attrs)
+    if blogger_image_size(url):
+        widths = [w for w in profile['widths'] if not original_width or w <= original_width]
+        if original_width and original_width < profile['widths'][-1] and original_width not in widths:
+            widths.append(original_width)
+        if not widths:
+            widths = [profile['widths'][0]]
+        src_width = max([w for w in widths if w <= profile['src']] or widths[:1])
+        result['src'] = blogger_image_url(url, src_width, aspect)
+        if len(widths) > 1:
+            result['srcset'] = ', '.join(f"{blogger_image_url(url, w, aspect)} {w}w" for w in widths)
+            display_width = _int_attr(attrs.get('width'))
+            result['sizes'] = (f"(max-width: {display_width}px) 100vw, {display_width}px"
+                               if display_width else profile['sizes'])
+        if not (attrs.get('width') and attrs.get('height')) and aspect:
+            result['width'] = str(src_width)
+            result['height'] = str(round(src_width / aspect))
+    eager = index is not None and index < profile.get('eager', 0)
+    result['loading'] = 'eager' if eager else 'lazy'
+    result['decoding'] = 'async'
+    if eager and index == 0:
+        result['fetchpriority'] = 'high'
+    return result
+
+
+def thumbnail_url(url, attrs=None):
+    """
+    URL thumbnail yang membawa ukuran asli gambar: jika ukurannya diketahui, segmen ukuran ditulis sebagai
+    w{lebar}-h{tinggi} asli, sehingga image_attrs() di template bisa menurunkan srcset, width dan height
+    dari URL saja (ukuran tampil dipilih oleh profil template).
+    """
+    original_width, aspect = image_dimensions(url, attrs)
+    if not blogger_image_size(url) or not (original_width and aspect):
+        return url
+    return blogger_image_url(url, original_width, aspect)
+
+
+def format_attrs(attrs):
+    return ' '.join(f'{name}="{value}"' for name, value in attrs.items())
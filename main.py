@@ -1,24 +1,42 @@
 import os
-import re
+import sys
+import json
 import math
-from utils import get_secret, get_blogger_posts
-from jinja2 import Environment, FileSystemLoader
-from bs4 import BeautifulSoup
-from datetime import datetime
+import shutil
+import tempfile
+import time
+from utils import get_secret, get_setting, slugify, parse_timestamp
+from models import Post
+from post_store import PostStore, sync_blogger_posts
+from blogger_client import BloggerClient, BLOGGER_API_BASE
+from manifest import BuildManifest, fingerprint, templates_fingerprint
+from output_writer import OutputWriter, content_hash
+from build_stats import BuildStats
+from search_index import assign_doc_numbers, build_search_index
+from images import BLOGGER_IMAGE_SIZE_RE, load_image_profiles, responsive_attrs, thumbnail_url, format_attrs
+from assets import AssetPipeline, compress, parse_precompress
+from sitemap import SitemapWriter, SITEMAP_MAX_URLS, SITEMAP_MAX_BYTES, SITEMAP_INDEX_FILES
+from shards import (shard_settings, shard_of, write_partial, load_processed_posts, load_rendered_pages,
+                    remove_partials)
+from datetime import datetime, timezone
+
+# Folder (di dalam direktori output) untuk menyimpan manifest build dan cache lainnya
+BUILD_CACHE_DIR = '.build_cache'
+
+# Parameter pengolahan HTML postingan
+THUMBNAIL_SIZE = 's320'
+PREVIEW_NUM_WORDS = 13
+CONTENT_IMAGE_SIZE = 's800'
 
 # --- Fungsi Pembantu (Sama seperti sebelumnya) ---
-def slugify(text):
-    text = str(text).lower()
-    text = re.sub(r'[^a-z0-9\s-]', '', text)
-    text = re.sub(r'[\s_-]+', '-', text)
-    text = re.sub(r'^-+', '', text)
-    text = re.sub(r'-+$', '', text)
-    return text
+# slugify sekarang ada di utils.py (dipakai juga oleh models.py)
 
 def parse_html_content_preview(html_content, num_words=30):
     if not html_content:
         return ""
     
+    from bs4 import BeautifulSoup
+
     soup = BeautifulSoup(html_content, 'html.parser')
     for script in soup(["script", "style"]):
         script.extract()
@@ -33,166 +51,592 @@ def parse_html_content_preview(html_content, num_words=30):
 def get_first_image_url(html_content, size='s320'):
     if not html_content:
         return None
+    from bs4 import BeautifulSoup
+
     soup = BeautifulSoup(html_content, 'html.parser')
     first_img = soup.find('img')
     if first_img and 'src' in first_img.attrs:
         img_url = first_img['src']
-        optimized_url = re.sub(r'/(s\d+|w\d+-h\d+)/', f'/{size}/', img_url)
+        optimized_url = BLOGGER_IMAGE_SIZE_RE.sub(f'/{size}/', img_url)
         return optimized_url
     return None
 
 def optimize_blogger_images_in_content(html_content, default_size='s800'):
     if not html_content:
         return ""
+    from bs4 import BeautifulSoup
+
     soup = BeautifulSoup(html_content, 'html.parser')
     for img_tag in soup.find_all('img'):
         if 'src' in img_tag.attrs:
             img_url = img_tag['src']
-            optimized_url = re.sub(r'/(s\d+|w\d+-h\d+)/', f'/{default_size}/', img_url)
+            optimized_url = BLOGGER_IMAGE_SIZE_RE.sub(f'/{default_size}/', img_url)
             img_tag['src'] = optimized_url
             img_tag['loading'] = 'lazy'  
             if not img_tag.get('alt', '').strip():
                 img_tag['alt'] = 'Gambar Postingan'  
     return str(soup)
 
+def process_post_html(html_content, num_words=30, thumbnail_size='s320', content_image_size='s800', image_profiles=None):
+    """
+    Mesin pengolahan HTML postingan: konten di-parse SEKALI, lalu dari pohon yang sama dihasilkan
+    teks preview, URL thumbnail dan konten dengan gambar yang dioptimalkan.
+    Tanpa image_profiles hasilnya identik dengan parse_html_content_preview, get_first_image_url dan
+    optimize_blogger_images_in_content yang masing-masing mem-parse ulang konten.
+
+    Args:
+        image_profiles (dict): Profil gambar responsif (images.load_image_profiles). Jika diisi, gambar
+                               isi postingan mendapat srcset/sizes/width/height (profil 'content') dan
+                               thumbnail dibuat dengan profil 'thumbnail'; thumbnail_size dan
+                               content_image_size tidak dipakai.
+
+    Returns:
+        tuple: (preview_text, thumbnail_url, optimized_content)
+    """
+    if not html_content:
+        return "", None, ""
+
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html_content, 'html.parser')
+
+    # 1. Thumbnail diambil dari src ASLI gambar pertama, sebelum src-nya ditulis ulang.
+    # 2. Semua gambar ditulis ulang: ukuran, lazy loading dan alt default.
+    first_image_url = None
+    for index, img_tag in enumerate(soup.find_all('img')):
+        if 'src' in img_tag.attrs:
+            img_url = img_tag['src']
+            if index == 0:
+                if image_profiles:
+                    first_image_url = thumbnail_url(img_url, img_tag.attrs)
+                else:
+                    first_image_url = BLOGGER_IMAGE_SIZE_RE.sub(f'/{thumbnail_size}/', img_url)
+            if image_profiles:
+                # Gambar pertama (biasanya di atas lipatan) eager dengan fetchpriority, sisanya lazy
+                img_tag.attrs.update(responsive_attrs(img_url, image_profiles['content'], index, img_tag.attrs))
+            else:
+                img_tag['src'] = BLOGGER_IMAGE_SIZE_RE.sub(f'/{content_image_size}/', img_url)
+                img_tag['loading'] = 'lazy'
+            if not img_tag.get('alt', '').strip():
+                img_tag['alt'] = 'Gambar Postingan'
+    optimized_content = str(soup)
+
+    # 3. Preview: buang script/style (setelah konten diserialisasi), lalu ambil N kata pertama.
+    for script in soup(["script", "style"]):
+        script.extract()
+    words = soup.get_text().split()
+    preview_text = " ".join(words[:num_words])
+    if len(words) > num_words:
+        preview_text += "..."
+
+    return preview_text, first_image_url, optimized_content
+
+def build_label_index(sorted_posts):
+    """
+    Membangun inverted index label -> postingan dari daftar postingan yang SUDAH diurutkan
+    (terbaru dulu), sehingga setiap posting list otomatis juga terurut berdasarkan tanggal.
+    Index ini dipakai untuk halaman kategori, sitemap dan related posts.
+
+    Returns:
+        dict: slug label -> {'name': ..., 'slug': ..., 'posts': [...]}
+    """
+    posts_by_label = {}
+    for post in sorted_posts:
+        for label, label_slug in zip(post.labels, post.label_slugs):
+            label_info = posts_by_label.get(label_slug)
+            if label_info is None:
+                label_info = posts_by_label[label_slug] = {
+                    'name': label,
+                    'slug': label_slug,
+                    'posts': []
+                }
+            # Label ganda pada satu postingan (atau dua label dengan slug sama) cukup dicatat sekali
+            if not label_info['posts'] or label_info['posts'][-1] is not post:
+                label_info['posts'].append(post)
+    return posts_by_label
+
+def find_related_posts(post, posts_by_label, post_rank, max_related=5, scan_limit=500):
+    """
+    Mencari related posts lewat inverted index label: kandidat diberi skor jumlah label yang sama,
+    lalu diurutkan berdasarkan skor (terbanyak dulu) kemudian tanggal (terbaru dulu).
+
+    Args:
+        post (Post): Postingan yang dicari related posts-nya.
+        posts_by_label (dict): Hasil build_label_index.
+        post_rank (dict): id postingan -> posisi dalam daftar terurut (0 = terbaru).
+        max_related (int): Jumlah related posts maksimal.
+        scan_limit (int): Hanya N postingan terbaru dari setiap label yang dipertimbangkan,
+                          agar biaya per postingan tetap konstan pada label yang sangat besar.
+                          0 berarti semua postingan dipertimbangkan.
+    """
+    label_slugs = set(post.label_slugs)
+    if not label_slugs or max_related <= 0:
+        return []
+
+    shared_counts = {}
+    candidates = {}
+    for label_slug in label_slugs:
+        label_posts = posts_by_label[label_slug]['posts']
+        if scan_limit:
+            label_posts = label_posts[:scan_limit]
+        for other_post in label_posts:
+            other_id = other_post.id
+            if other_id == post.id:
+                continue
+            shared_counts[other_id] = shared_counts.get(other_id, 0) + 1
+            candidates[other_id] = other_post
+
+    ranked_ids = sorted(shared_counts, key=lambda other_id: (-shared_counts[other_id], post_rank[other_id]))
+    return [candidates[other_id] for other_id in ranked_ids[:max_related]]
+
+# --- Paginasi Listing (index dan kategori) ---
+PAGINATION_MODES = ('newest', 'stable', 'month')
+MONTH_NAMES = ('Januari', 'Februari', 'Maret', 'April', 'Mei', 'Juni',
+               'Juli', 'Agustus', 'September', 'Oktober', 'November', 'Desember')
+
+def month_label(month_key):
+    """'2024-03' -> 'Maret 2024'"""
+    year, month = month_key.split('-')
+    return f"{MONTH_NAMES[int(month) - 1]} {year}"
+
+def paginate_listing(posts, per_page, first_url, archive_url, mode='newest'):
+    """
+    Membagi postingan sebuah listing (index atau kategori) menjadi halaman.
+
+    Args:
+        posts (list): Postingan listing, terurut terbaru dulu.
+        per_page (int): Jumlah postingan per halaman.
+        first_url (str): URL halaman pertama ('/' atau '/kategori/<slug>.html').
+        archive_url (callable): Key halaman -> URL halaman tersebut.
+        mode (str): 'newest' - halaman 1..N dihitung dari postingan terbaru (setiap postingan baru
+                               menggeser isi SEMUA halaman).
+                    'stable' - halaman pertama berisi postingan terbaru; halaman arsip dinomori dari
+                               postingan terlama (arsip 1 = postingan terlama), jadi isi arsip lama tidak berubah.
+                    'month'  - halaman pertama berisi postingan terbaru; satu halaman arsip per bulan terbit.
+
+    Returns:
+        list: Tuple (url, postingan_halaman, konteks_paginasi): halaman pertama dulu, lalu halaman
+              berikutnya/arsip dari yang terbaru ke yang terlama.
+    """
+    if not posts:
+        return []
+    if mode == 'newest':
+        total_pages = math.ceil(len(posts) / per_page)
+        urls = [first_url] + [archive_url(page_num) for page_num in range(2, total_pages + 1)]
+        return [(urls[page_num - 1], posts[(page_num - 1) * per_page:page_num * per_page], {
+            'current_page': page_num,
+            'total_pages': total_pages,
+            'prev_page_url': urls[page_num - 2] if page_num > 1 else None,
+            'next_page_url': urls[page_num] if page_num < total_pages else None,
+        }) for page_num in range(1, total_pages + 1)]
+
+    # Arsip: (key, postingan, label), terbaru dulu
+    archives = []
+    if len(posts) > per_page:
+        if mode == 'month':
+            for post in posts:
+                # Bulan dihitung dalam UTC: postingan dengan offset zona waktu berbeda di sekitar pergantian bulan
+                # tetap urut per bulan, jadi setiap bulan hanya punya satu halaman arsip
+                month_key = post.published.astimezone(timezone.utc).strftime('%Y-%m')
+                if not archives or archives[-1][0] != month_key:
+                    archives.append((month_key, [], f"Arsip {month_label(month_key)}"))
+                archives[-1][1].append(post)
+        else:
+            total_posts = len(posts)
+            # Postingan ke-k dari yang terlama (mulai 0) selalu berada di arsip k // per_page + 1
+            for number in range(math.ceil(total_posts / per_page), 0, -1):
+                start_index = max(0, total_posts - number * per_page)
+                end_index = total_posts - (number - 1) * per_page
+                archives.append((number, posts[start_index:end_index], f"Arsip {number}"))
+
+    # Prev = halaman yang lebih baru, Next = halaman yang lebih lama (sama seperti mode 'newest')
+    urls = [first_url] + [archive_url(key) for key, _, _ in archives]
+    pages = [(first_url, posts[:per_page], {
+        'current_page': 1,
+        'total_pages': None,
+        'page_label': None,
+        'prev_page_url': None,
+        'next_page_url': urls[1] if archives else None,
+    })]
+    for i, (key, archive_posts, label) in enumerate(archives, start=1):
+        pages.append((urls[i], archive_posts, {
+            'current_page': key,
+            'total_pages': None,
+            'page_label': label,
+            'prev_page_url': urls[i - 1],
+            'next_page_url': urls[i + 1] if i + 1 < len(urls) else None,
+        }))
+    return pages
+
+# --- Rendering Halaman (Serial atau Paralel dengan Process Pool) ---
+def format_date(value, fmt="%d %b %Y"):
+    # Filter untuk memformat tanggal. Post.published sudah berupa datetime (di-parse sekali);
+    # string ISO 8601 (contoh: "2023-10-27T10:00:00Z") tetap didukung.
+    if isinstance(value, str):
+        value = parse_timestamp(value)
+    return value.strftime(fmt)
+
+# Fragmen yang isinya sama di semua halaman: nama di konteks 'fragments' -> file template
+SHARED_FRAGMENTS = {
+    'header': 'custom_header.html',
+    'sidebar': 'custom_sidebar.html',
+    'footer': 'custom_footer.html',
+}
+
+def create_template_environment(template_dir, bytecode_cache_dir=None, compiled_template_dir=None):
+    """
+    Environment Jinja untuk merender halaman.
+
+    Args:
+        bytecode_cache_dir (str): Folder bytecode cache persisten (template di-compile dari source
+                                  sekali, lalu dimuat dari cache).
+        compiled_template_dir (str): Folder hasil precompile_templates(); jika diisi, template dimuat
+                                     langsung sebagai modul Python (tanpa parsing sama sekali).
+    """
+    # Jinja baru di-import saat ada halaman yang perlu dirender
+    from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache, ModuleLoader, pass_context
+
+    if compiled_template_dir:
+        env = Environment(loader=ModuleLoader(compiled_template_dir))
+    else:
+        # Bytecode cache persisten: build berikutnya tidak perlu meng-compile ulang template
+        bytecode_cache = None
+        if bytecode_cache_dir:
+            os.makedirs(bytecode_cache_dir, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(bytecode_cache_dir)
+        env = Environment(loader=FileSystemLoader(template_dir), bytecode_cache=bytecode_cache)
+    env.filters['slugify'] = slugify
+    env.filters['date_format'] = format_date
+    env.globals['image_attrs'] = pass_context(image_attrs)
+    return env
+
+def precompile_templates(template_dir, cache_dir, template_fingerprint):
+    """
+    Meng-compile semua template menjadi modul Python di cache_dir (sekali per versi template dan Jinja),
+    untuk dimuat create_template_environment(compiled_template_dir=...). Versi lama dihapus.
+
+    Returns:
+        str: Folder modul template.
+    """
+    import jinja2
+
+    key = fingerprint(template_fingerprint, jinja2.__version__)[:16]
+    compiled_dir = os.path.join(cache_dir, key)
+    if not os.path.isdir(compiled_dir):
+        os.makedirs(cache_dir, exist_ok=True)
+        # Ditulis ke folder sementara dulu, supaya build yang terhenti tidak meninggalkan modul setengah jadi
+        tmp_dir = tempfile.mkdtemp(dir=cache_dir, prefix='.tmp-')
+        create_template_environment(template_dir).compile_templates(tmp_dir, zip=None, ignore_errors=False)
+        os.replace(tmp_dir, compiled_dir)
+        print(f"Template di-compile ke {compiled_dir}")
+    for name in os.listdir(cache_dir):
+        if name != key:
+            shutil.rmtree(os.path.join(cache_dir, name), ignore_errors=True)
+    return compiled_dir
+
+def image_attrs(context, url, profile_name, index=None, dimensions=True):
+    """
+    Atribut src (dan srcset, sizes, width, height, loading, decoding) untuk <img> di template.
+    Tanpa RESPONSIVE_IMAGES hanya src="..." yang dihasilkan, sama seperti sebelumnya.
+
+    Args:
+        profile_name (str): Profil gambar yang dipakai template ini (lihat images.py).
+        index (int): Posisi gambar di daftar (misalnya loop.index0), untuk eager/lazy loading.
+        dimensions (bool): False jika template sudah menulis width/height sendiri.
+    """
+    image_profiles = context.get('image_profiles')
+    if not image_profiles:
+        return f'src="{url}"'
+    attrs = responsive_attrs(url, image_profiles[profile_name], index)
+    if not dimensions:
+        attrs.pop('width', None)
+        attrs.pop('height', None)
+    return format_attrs(attrs)
+
+def render_shared_fragments(env, shared_context):
+    """
+    Merender header, sidebar dan footer SEKALI per build. Hasilnya dipakai base_template.html
+    lewat konteks 'fragments', sehingga tidak dirender ulang di setiap halaman.
+    Fragmen hanya melihat konteks bersama (recent_posts, all_labels, current_year).
+    """
+    from markupsafe import Markup
+
+    return {key: Markup(env.get_template(name).render(shared_context))
+            for key, name in SHARED_FRAGMENTS.items()}
+
+_render_worker_state = None
+
+def _init_render_worker(template_dir, output_dir, shared_context, bytecode_cache_dir=None, env=None, post_store_path=None,
+                        asset_pipeline=None, compiled_template_dir=None):
+    global _render_worker_state
+    if env is None:
+        env = create_template_environment(template_dir, bytecode_cache_dir, compiled_template_dir)
+    post_store = PostStore(post_store_path, readonly=True) if post_store_path else None
+    _render_worker_state = (env, output_dir, shared_context, post_store, asset_pipeline)
+
+def _load_post_body(post, post_store, image_profiles=None):
+    """
+    Isi postingan (optimized_content) untuk halaman yang akan dirender: dari konten mentah yang masih
+    ada di Post, atau (build streaming) dari post store di disk.
+    """
+    content = post.content
+    if content is None and post_store is not None:
+        stored_body = post_store.get_body(post.id, post.content_hash)
+        if stored_body is not None:
+            return stored_body
+        content = post_store.get_content(post.id)
+    return process_post_html(
+        content, num_words=PREVIEW_NUM_WORDS,
+        thumbnail_size=THUMBNAIL_SIZE, content_image_size=CONTENT_IMAGE_SIZE, image_profiles=image_profiles)[2]
+
+def _render_page(env, shared_context, post_store, template_name, context):
+    post = context.get('post')
+    lazy_body = post is not None and post.optimized_content is None
+    if lazy_body:
+        # Isi postingan dimuat (atau dioptimalkan) di worker, hanya saat halamannya dirender
+        post.optimized_content = _load_post_body(post, post_store, shared_context.get('image_profiles'))
+    rendered_html = env.get_template(template_name).render(shared_context, **context)
+    if lazy_body:
+        # ...dan dilepas lagi begitu halamannya selesai, supaya memori tidak ikut membesar
+        post.optimized_content = None
+    return rendered_html
+
+def _render_page_jobs(jobs):
+    env, output_dir, shared_context, post_store, asset_pipeline = _render_worker_state
+    writer = OutputWriter(output_dir, {job[0]: job[3] for job in jobs if job[3]})
+    results = []
+    for rel_path, template_name, context, _known_hash in jobs:
+        start = time.perf_counter()
+        rendered_html = _render_page(env, shared_context, post_store, template_name, context)
+        if asset_pipeline is not None:
+            rendered_html = asset_pipeline.process_html(rendered_html, template_name)
+        written = writer.write(rel_path, rendered_html)
+        if asset_pipeline is not None:
+            # Salinan .gz/.br hanya dibuat ulang jika HTML-nya berubah (atau salinannya belum ada)
+            for fmt in asset_pipeline.precompress:
+                compressed_path = f"{rel_path}.{fmt}"
+                if written or not os.path.exists(os.path.join(output_dir, compressed_path)):
+                    writer.write(compressed_path, compress(rendered_html.encode('utf-8'), fmt))
+        results.append((rel_path, writer.hashes[rel_path], written, time.perf_counter() - start))
+    return results
+
+def render_pages(jobs, template_dir, output_dir, shared_context, workers=1, chunk_size=None, bytecode_cache_dir=None,
+                 post_store_path=None, asset_pipeline=None, critical_samples=None, compiled_template_dir=None):
+    """
+    Merender dan menulis halaman.
+
+    Args:
+        jobs (list): Tuple (rel_path, nama_template, konteks_halaman, hash_output_sebelumnya).
+        shared_context (dict): Konteks yang sama untuk semua halaman (sidebar, label, tahun).
+                               Fragmen header/sidebar/footer dirender sekali dari konteks ini.
+        workers (int): 1 = serial di proses ini; > 1 = job dibagi per chunk ke process pool
+                       dan setiap worker menulis file-nya sendiri.
+        chunk_size (int): Jumlah job per unit kerja (default: dihitung dari jumlah job dan worker).
+        bytecode_cache_dir (str): Folder bytecode cache Jinja (None = tanpa cache).
+        compiled_template_dir (str): Folder template yang sudah di-compile (precompile_templates);
+                                     jika diisi, bytecode_cache_dir tidak dipakai.
+        post_store_path (str): Post store tempat isi postingan dibaca jika tidak ada di Post (build streaming).
+        asset_pipeline (AssetPipeline): Minifikasi, CSS kritis dan salinan terkompresi (None = HTML apa adanya).
+        critical_samples (dict): nama_template -> konteks halaman contoh untuk CSS kritis template yang
+                                 belum ada di asset_pipeline. Contohnya dirender sekali di proses utama.
+
+    Returns:
+        list: Tuple (rel_path, hash_isi, ditulis, detik) dalam urutan yang sama dengan jobs.
+              'ditulis' False berarti isi file sama dengan yang sudah ada sehingga tidak ditulis ulang;
+              'detik' adalah waktu render + tulis halaman itu.
+    """
+    if not jobs:
+        return []
+    env = create_template_environment(template_dir, bytecode_cache_dir, compiled_template_dir)
+    shared_context = dict(shared_context, fragments=render_shared_fragments(env, shared_context))
+    if asset_pipeline is not None and critical_samples:
+        post_store = PostStore(post_store_path, readonly=True) if post_store_path else None
+        try:
+            for template_name, context in critical_samples.items():
+                asset_pipeline.add_critical_css(
+                    template_name, _render_page(env, shared_context, post_store, template_name, context))
+        finally:
+            if post_store is not None:
+                post_store.close()
+    if workers <= 1 or len(jobs) < 2:
+        _init_render_worker(template_dir, output_dir, shared_context, env=env, post_store_path=post_store_path,
+                            asset_pipeline=asset_pipeline)
+        try:
+            return _render_page_jobs(jobs)
+        finally:
+            if _render_worker_state[3] is not None:
+                _render_worker_state[3].close()
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    if chunk_size is None:
+        chunk_size = max(1, min(64, math.ceil(len(jobs) / (workers * 4))))
+    chunks = [jobs[i:i + chunk_size] for i in range(0, len(jobs), chunk_size)]
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_render_worker,
+                             initargs=(template_dir, output_dir, shared_context, bytecode_cache_dir, None, post_store_path,
+                                       asset_pipeline, compiled_template_dir)) as pool:
+        # pool.map mempertahankan urutan chunk, jadi log tetap berurutan
+        for chunk_results in pool.map(_render_page_jobs, chunks):
+            results.extend(chunk_results)
+    return results
+
+def page_owner_shard(stage, context, shard_count):
+    """
+    Shard yang merender sebuah halaman di build terpartisi (lihat shards.py): halaman postingan menurut id
+    postingan, halaman kategori menurut slug label. None untuk halaman global (index), yang dirender di fase merge.
+    """
+    if stage == 'post':
+        return shard_of(context['post'].id, shard_count)
+    if stage == 'kategori':
+        return shard_of(context['label_slug'], shard_count)
+    return None
+
 # --- Fungsi untuk Generate Sitemap ---
-def generate_sitemap(processed_posts, all_labels, total_main_pages, posts_per_main_page, posts_by_label, base_url="https://www.yourdomain.com"):
+def generate_sitemap(processed_posts, listing_pages, base_url="https://www.yourdomain.com", writer=None,
+                     max_urls=SITEMAP_MAX_URLS, max_bytes=SITEMAP_MAX_BYTES, compress=False, stats=None):
     """
-    Menghasilkan sitemap.xml yang valid untuk Google Search Console dari postingan dan halaman yang diproses.
+    Menghasilkan sitemap yang valid untuk Google Search Console dari postingan dan halaman yang diproses.
+    URL ditulis secara streaming ke sitemap-posts-N.xml, sitemap-pages-N.xml dan sitemap-categories-N.xml,
+    lalu dirangkum di sitemap_index.xml (juga ditulis sebagai sitemap.xml).
 
     Args:
-        processed_posts (list): Daftar dictionary, di mana setiap dictionary mewakili postingan yang telah diproses sepenuhnya.
-        all_labels (set): Set semua label/kategori unik.
-        total_main_pages (int): Total jumlah halaman indeks utama yang dipaginasi.
-        posts_per_main_page (int): Jumlah postingan per halaman indeks utama.
-        posts_by_label (dict): Dictionary yang memetakan slug label ke informasi dan postingannya.
+        processed_posts (list): Daftar Post yang telah diproses sepenuhnya, terurut terbaru dulu.
+        listing_pages (list): Halaman listing yang dihasilkan (index dan kategori, sesuai mode paginasi),
+                              dict dengan 'stage' ('index'/'kategori'), 'url', 'first' (halaman pertama
+                              listing) dan 'lastmod' ('YYYY-MM-DD').
         base_url (str): URL dasar situs web Anda (misalnya, "https://www.yourdomain.com").
                         Penting untuk URL absolut dalam sitemap.
+        writer (OutputWriter): Penulis output yang dipakai (default: OutputWriter di direktori kerja).
+        max_urls (int): Jumlah URL maksimal per file sitemap.
+        max_bytes (int): Ukuran maksimal per file sitemap (byte, sebelum kompresi).
+        compress (bool): Juga menulis salinan .xml.gz dari setiap sitemap.
+        stats (BuildStats): Tempat mencatat waktu dan jumlah URL per jenis sitemap (opsional).
+
+    Returns:
+        list: Path relatif semua file sitemap yang dihasilkan.
     """
-    print("Menghasilkan sitemap.xml...")
-    sitemap_entries = []
-
-    # 1. Tambahkan URL postingan individual
-    for post in processed_posts:
-        loc = f"{base_url}/{slugify(post.get('title', 'untitled-post'))}.html"
-        lastmod = post.get('updated', post.get('published'))
-        if lastmod:
-            try:
-                # Periksa apakah lastmod adalah string sebelum mencoba memformat
-                if isinstance(lastmod, str):
-                    lastmod = datetime.fromisoformat(lastmod.replace('Z', '+00:00')).strftime('%Y-%m-%d')
-                else:
-                    lastmod = None # Tangani jika bukan string atau format tidak dikenal
-            except ValueError:
-                lastmod = None
-
-        sitemap_entries.append({
-            'loc': loc,
-            'lastmod': lastmod,
-            'changefreq': 'weekly', # Sesuaikan sesuai kebutuhan (misalnya, daily, weekly, monthly)
-            'priority': '0.8' # Sesuaikan prioritas (0.0 hingga 1.0)
-        })
-
-    # 2. Tambahkan indeks utama dan halaman berpaginasi
-    for page_num in range(1, total_main_pages + 1):
-        if page_num == 1:
-            loc = base_url + "/"
-        else:
-            loc = f"{base_url}/pages/{page_num}.html"
-
-        # Gunakan tanggal terbit postingan terbaru sebagai lastmod untuk halaman indeks/paginasi utama
-        last_modified_main_page = None
-        if processed_posts: # Pastikan ada postingan yang diproses
-            last_modified_main_page = datetime.fromisoformat(processed_posts[0]['published'].replace('Z', '+00:00')).strftime('%Y-%m-%d')
-
-        sitemap_entries.append({
-            'loc': loc,
-            'lastmod': last_modified_main_page or datetime.now().strftime('%Y-%m-%d'),
-            'changefreq': 'daily',
-            'priority': '1.0' if page_num == 1 else '0.7'
-        })
-
-    # 3. Tambahkan halaman kategori (utama dan berpaginasi)
-    posts_per_category_page = 5 # Sama seperti yang digunakan dalam logika pembuatan halaman
-
-    for label_slug, label_info in posts_by_label.items():
-        category_posts = sorted(label_info['posts'], key=lambda p: datetime.fromisoformat(p['published'].replace('Z', '+00:00')), reverse=True)
-        total_category_posts = len(category_posts)
-        total_category_pages = math.ceil(total_category_posts / posts_per_category_page)
-
-        for page_num in range(1, total_category_pages + 1):
-            if page_num == 1:
-                loc = f"{base_url}/kategori/{label_slug}.html"
-            else:
-                loc = f"{base_url}/kategori/{label_slug}/page/{page_num}.html"
-
-            # Gunakan tanggal terbit postingan terbaru dalam kategori itu untuk lastmod
-            last_modified_category_page = None
-            if category_posts:
-                last_modified_category_page = datetime.fromisoformat(category_posts[0]['published'].replace('Z', '+00:00')).strftime('%Y-%m-%d')
-
-            sitemap_entries.append({
-                'loc': loc,
-                'lastmod': last_modified_category_page or datetime.now().strftime('%Y-%m-%d'),
-                'changefreq': 'weekly',
-                'priority': '0.7' if page_num == 1 else '0.5'
-            })
-
-    # Struktur XML untuk sitemap
-    sitemap_xml_template = """<?xml version="1.0" encoding="UTF-8"?>
-<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
-{urls}
-</urlset>"""
-
-    url_entry_template = """    <url>
-        <loc>{loc}</loc>
-        {lastmod_tag}
-        <changefreq>{changefreq}</changefreq>
-        <priority>{priority}</priority>
-    </url>"""
-
-    url_entries_str = []
-    for entry in sitemap_entries:
-        lastmod_tag = f"<lastmod>{entry['lastmod']}</lastmod>" if entry['lastmod'] else ""
-        url_entries_str.append(url_entry_template.format(
-            loc=entry['loc'],
-            lastmod_tag=lastmod_tag,
-            changefreq=entry['changefreq'],
-            priority=entry['priority']
-        ))
-
-    final_sitemap_xml = sitemap_xml_template.format(urls="\n".join(url_entries_str))
-
-    # Simpan sitemap.xml ke direktori output root
-    sitemap_file_path = os.path.join(os.getcwd(), 'sitemap.xml')
-    with open(sitemap_file_path, "w", encoding="utf-8") as f:
-        f.write(final_sitemap_xml)
-    print(f"Sitemap berhasil dibuat di: {sitemap_file_path}")
+    print("Menghasilkan sitemap...")
+    if writer is None:
+        writer = OutputWriter(os.getcwd())
+    sitemap_writer = SitemapWriter(writer, base_url, max_urls=max_urls, max_bytes=max_bytes, compress=compress)
+
+    # 1. URL postingan individual
+    def post_entries():
+        for post in processed_posts:
+            yield {
+                'loc': f"{base_url}{post.detail_url}",
+                'lastmod': post.lastmod.strftime('%Y-%m-%d'),
+                'changefreq': 'weekly', # Sesuaikan sesuai kebutuhan (misalnya, daily, weekly, monthly)
+                'priority': '0.8' # Sesuaikan prioritas (0.0 hingga 1.0)
+            }
+
+    # 2. Indeks utama dan halaman berpaginasi
+    # lastmod: tanggal terbit postingan terbaru di listing (mode 'newest') atau di halaman itu (paginasi stabil)
+    def page_entries():
+        for page in listing_pages:
+            if page['stage'] == 'index':
+                yield {
+                    'loc': f"{base_url}{page['url']}",
+                    'lastmod': page['lastmod'],
+                    'changefreq': 'daily',
+                    'priority': '1.0' if page['first'] else '0.7'
+                }
+
+    # 3. Halaman kategori (utama dan berpaginasi)
+    def category_entries():
+        for page in listing_pages:
+            if page['stage'] == 'kategori':
+                yield {
+                    'loc': f"{base_url}{page['url']}",
+                    'lastmod': page['lastmod'],
+                    'changefreq': 'weekly',
+                    'priority': '0.7' if page['first'] else '0.5'
+                }
+
+    if stats is None:
+        stats = BuildStats()
+    for sitemap_type, entries in (('posts', post_entries()), ('pages', page_entries()), ('categories', category_entries())):
+        with stats.measure(f'sitemap_{sitemap_type}'):
+            sitemap_writer.write_urls(sitemap_type, entries)
+        stats.count(f'sitemap_{sitemap_type}_urls', sitemap_writer.url_counts.get(sitemap_type, 0))
+    with stats.measure('sitemap_index'):
+        sitemap_writer.write_index()
+    stats.count('sitemap_files', len(sitemap_writer.sitemaps))
+
+    sitemap_files = sitemap_writer.output_files()
+    print(f"Sitemap: {len(sitemap_writer.sitemaps)} file sitemap + index di {os.path.join(writer.output_dir, SITEMAP_INDEX_FILES[0])}")
+    return sitemap_files
 
 # --- Fungsi Utama ---
 def main():
+    # Waktu, CPU, memori dan jumlah item per tahap build; ditulis ke file JSON jika BUILD_REPORT diisi.
+    # BUILD_PROFILE=render,process (atau 'all') menulis profil cProfile/tracemalloc tahap itu (lihat build_stats.py).
+    stats = BuildStats(profile=get_setting('BUILD_PROFILE'),
+                       profile_dir=get_setting('BUILD_PROFILE_DIR', os.path.join(BUILD_CACHE_DIR, 'profile')))
     try:
-        blogger_api_key = get_secret("BLOGGER_API_KEY")
-        blog_id = get_secret("BLOG_ID")
-
-        print("Fetching ALL Blogger posts...")
-        all_posts_raw = [] # Mengubah nama variabel agar lebih jelas
-        next_page_token = None
-        while True:
-            posts_data = get_blogger_posts(blog_id, blogger_api_key, max_results=500, page_token=next_page_token)  
-            if posts_data and 'items' in posts_data:
-                for post_item in posts_data['items']:
-                    if 'content' in post_item:
-                        all_posts_raw.append(post_item)
-                next_page_token = posts_data.get('nextPageToken')
-                if not next_page_token:
-                    break
+        output_dir = os.getcwd()  
+        os.makedirs(output_dir, exist_ok=True)  
+
+        # --- BUILD TERPARTISI (opsional, lihat shards.py) ---
+        # BUILD_PHASE=fetch|process|render|merge membagi build ke BUILD_SHARDS shard (BUILD_SHARD = nomor shard ini)
+        # yang bisa berjalan di mesin berbeda. Tanpa BUILD_PHASE build berjalan biasa dalam satu proses.
+        build_phase, shard_index, shard_count = shard_settings(
+            get_setting('BUILD_PHASE', ''), get_setting('BUILD_SHARD', 0), get_setting('BUILD_SHARDS', 0))
+        shard_dir = get_setting('BUILD_SHARD_DIR', os.path.join(output_dir, BUILD_CACHE_DIR, 'shards'))
+
+        stats.begin('fetch')
+
+        # --- SINKRONISASI POSTINGAN KE STORE LOKAL ---
+        # Store SQLite menyimpan snapshot terakhir; hanya postingan yang berubah yang diunduh ulang.
+        # Set OFFLINE=1 untuk build langsung dari store tanpa memanggil API Blogger.
+        post_store_path = os.path.join(output_dir, BUILD_CACHE_DIR, 'posts.sqlite3')
+        post_store = PostStore(post_store_path)
+        try:
+            if build_phase in ('process', 'render', 'merge'):
+                # Semua shard harus melihat snapshot yang sama, jadi hanya fase fetch yang memanggil API
+                print(f"Fase {build_phase}: membangun dari post store lokal ({len(post_store)} postingan).")
+            elif get_setting('OFFLINE', False):
+                print(f"OFFLINE aktif: membangun dari post store lokal ({len(post_store)} postingan).")
             else:
-                break
+                blogger_api_key = get_secret("BLOGGER_API_KEY")
+                blog_id = get_secret("BLOG_ID")
+
+                # BLOGGER_API_BASE bisa diarahkan ke server lokal untuk pengujian/benchmark.
+                # BLOGGER_QUOTA_LIMIT membatasi jumlah request API per build (0 = tanpa batas).
+                blogger_client = BloggerClient(
+                    blogger_api_key,
+                    base_url=get_setting('BLOGGER_API_BASE', BLOGGER_API_BASE),
+                    timeout=get_setting('BLOGGER_TIMEOUT', 30),
+                    max_retries=get_setting('BLOGGER_MAX_RETRIES', 5),
+                    quota_limit=get_setting('BLOGGER_QUOTA_LIMIT', 0),
+                )
+                try:
+                    print("Syncing Blogger posts...")
+                    if not sync_blogger_posts(post_store, blogger_client, blog_id, max_results=500,
+                                              sync_deletions=get_setting('SYNC_DELETIONS', True)):
+                        if not len(post_store):
+                            # Tanpa snapshot build akan menghasilkan situs kosong; lebih baik gagal daripada di-deploy
+                            stats.error = "Sinkronisasi gagal dan post store kosong: tidak ada snapshot untuk dibangun."
+                            print(stats.error)
+                            sys.exit(1)
+                        print("Sinkronisasi gagal, memakai snapshot terakhir dari post store.")
+                    print(f"Blogger API: {blogger_client.summary()}.")
+                    stats.count('api_requests', blogger_client.request_count)
+                    stats.count('api_retries', blogger_client.retry_count)
+                finally:
+                    blogger_client.close()
+
+            stored_post_count = len(post_store)
+            stats.count('posts_stored', stored_post_count)
+        finally:
+            post_store.close()
+
+        if build_phase == 'fetch':
+            print(f"Fase fetch selesai: {stored_post_count} postingan di post store.")
+            return
         
-        if all_posts_raw: # Menggunakan all_posts_raw
-            output_dir = os.getcwd()  
-            os.makedirs(output_dir, exist_ok=True)  
+        if stored_post_count:
             print(f"Output directory created/ensured: {output_dir}")
 
             pages_output_dir = os.path.join(output_dir, 'pages')
@@ -207,59 +651,129 @@ def main():
             if not os.path.isdir(template_dir):
                 raise FileNotFoundError(f"Template directory not found: {template_dir}")
             
-            template_loader = FileSystemLoader(template_dir)
-            env = Environment(loader=template_loader)
-            
-            env.filters['slugify'] = slugify
-            
-            # Filter baru untuk mengonversi tanggal, asumsikan 'published' format ISO 8601
-            # Contoh: "2023-10-27T10:00:00Z"
-            env.filters['date_format'] = lambda value, fmt="%d %b %Y": datetime.fromisoformat(value.replace('Z', '+00:00')).strftime(fmt)
-            
-            list_posts_template = env.get_template('index_template.html')  
-            single_post_template = env.get_template('single_post_template.html')
-            category_detail_template = env.get_template('category_detail_template.html')
+            # Jumlah worker render. 1 = serial, 0 = sebanyak jumlah core CPU.
+            render_workers = get_setting('BUILD_WORKERS', 1)
+            if render_workers <= 0:
+                render_workers = os.cpu_count() or 1
+
+            # --- MANIFEST BUILD UNTUK REBUILD INKREMENTAL ---
+            # Manifest menyimpan id, 'updated', hash konten dan output tiap postingan, serta
+            # fingerprint input setiap halaman. Halaman yang inputnya tidak berubah tidak dirender ulang.
+            # Set FULL_REBUILD=1 untuk memaksa semua halaman dirender ulang.
+            manifest = BuildManifest(os.path.join(output_dir, BUILD_CACHE_DIR, 'manifest.json'), output_dir)
+            if get_setting('FULL_REBUILD', False):
+                print("FULL_REBUILD aktif: semua halaman akan dirender ulang.")
+                manifest.reset()
+
+            # --- ANTRIAN RENDER ---
+            # Semua halaman dikumpulkan dulu sebagai job, lalu dirender sekaligus (serial atau paralel).
+            # Jika dua halaman punya path sama (misalnya dua judul dengan slug sama), job TERAKHIR yang
+            # dipakai, sama seperti file lama yang tertimpa saat render berurutan.
+            page_queue = {}
+
+            def queue_page(stage, rel_path, page_fingerprint, template_name, context):
+                page_queue.pop(rel_path, None)
+                page_queue[rel_path] = (stage, page_fingerprint, template_name, context)
 
             # --- PRE-PROCESS SEMUA POSTINGAN UNTUK MEMBANGUN DATA YANG DIBUTUHKAN ---
+            stats.begin('process')
+            # Postingan dibaca satu per satu dari post store. Pada build streaming (default), isi postingan
+            # disimpan ke disk setelah diolah dan hanya metadata yang tetap di memori; isinya dimuat lagi
+            # saat halaman postingan dirender. Set STREAMING_BUILD=0 untuk menyimpan isi di memori.
+            streaming_build = get_setting('STREAMING_BUILD', True)
+            # RESPONSIVE_IMAGES=1: srcset/sizes/width/height dan eager/lazy loading untuk gambar Blogger.
+            # Profil per template bisa diubah lewat IMAGE_PROFILES (JSON, lihat images.py).
+            image_profiles = load_image_profiles(get_setting('IMAGE_PROFILES', '')) if get_setting('RESPONSIVE_IMAGES', False) else None
+            processing_params = (THUMBNAIL_SIZE, PREVIEW_NUM_WORDS, CONTENT_IMAGE_SIZE) + ((image_profiles,) if image_profiles else ())
+            # Fase render/merge: hasil olahan semua postingan diambil dari partial fase process. Isi postingan
+            # yang sudah dioptimalkan hanya disimpan untuk postingan yang halamannya dirender shard ini.
+            # Fase merge menyimpan semua isi dari partial ke post store-nya, yang menjadi cache build berikutnya.
+            post_store = PostStore(post_store_path)
+            processed_posts = None
+            if build_phase in ('render', 'merge'):
+                processed_posts = load_processed_posts(
+                    shard_dir, shard_count,
+                    keep_body=lambda post_id: build_phase == 'render' and shard_of(post_id, shard_count) == shard_index,
+                    store_body=post_store.put_body if build_phase == 'merge' and streaming_build else None)
+            shard_posts = {}
             fully_processed_posts = []
             all_labels = set()  
-            posts_by_label = {}  
+            reused_count = 0
+            stored_body_count = 0
 
-            for post_item in all_posts_raw:
-                post = post_item.copy()  
-
-                post_slug = slugify(post.get('title', 'untitled-post'))
-                # Gunakan 'id' atau 'url' dari Blogger jika ada untuk detail_url yang lebih stabil
-                # Atau tetap pakai slug jika Anda ingin URL statis
-                # post['detail_url'] = post.get('url') # Jika ingin pakai URL asli Blogger
-                post['detail_url'] = f"/{post_slug}.html" # Jika ingin pakai slug sebagai URL file lokal
+            for post_item in post_store.iter_posts():
+                post_start = time.perf_counter()
+                # Pastikan konten dan tanggal 'published' ada dan valid untuk sorting
+                if 'content' not in post_item or 'published' not in post_item:
+                    continue
+                # Post hanya menyimpan field yang dibutuhkan; tanggal, slug dan detail_url dihitung sekali di sini
+                post = Post.from_blogger(post_item)
+                if build_phase == 'process' and shard_of(post.id, shard_count) != shard_index:
+                    continue
                 
-                raw_html_content = post.get('content', '')
-                post['thumbnail_url'] = get_first_image_url(raw_html_content, size='s320')
-                post['parsed_content'] = parse_html_content_preview(raw_html_content, num_words=13)  
-                post['optimized_content'] = optimize_blogger_images_in_content(raw_html_content, default_size='s800')  
+                # Hash konten ikut memuat parameter pengolahan, supaya perubahan ukuran/jumlah kata
+                # otomatis membatalkan hasil olahan yang tersimpan di manifest.
+                post.content_hash = fingerprint(post.content, *processing_params)
+                post_updated = post_item.get('updated')
+                if processed_posts is not None:
+                    cached = processed_posts.get(post.id)
+                    if not cached or cached['updated'] != post_updated or cached['hash'] != post.content_hash:
+                        raise ValueError(f"Partial fase process tidak cocok dengan post store untuk postingan {post.id}; "
+                                         "jalankan ulang fase process dengan post store yang sama.")
+                else:
+                    cached = manifest.cached_post(post.id, post_updated, post.content_hash)
+                if cached:
+                    post.thumbnail_url = cached['thumbnail_url']
+                    post.parsed_content = cached['parsed_content']
+                    if cached.get('body') is not None:
+                        post.optimized_content = cached['body']
+                        post.content = None
+                    reused_count += 1
+                else:
+                    post.parsed_content, post.thumbnail_url, post.optimized_content = process_post_html(
+                        post.content, num_words=PREVIEW_NUM_WORDS,
+                        thumbnail_size=THUMBNAIL_SIZE, content_image_size=CONTENT_IMAGE_SIZE, image_profiles=image_profiles)
+                    # Konten mentah hanya dibutuhkan untuk membuat optimized_content
+                    post.content = None
+                # Untuk postingan yang tidak berubah, 'optimized_content' hanya dihitung jika halamannya
+                # benar-benar perlu dirender ulang (lihat _render_page_jobs).
+                post_entry = manifest.record_post(post.id, post_updated, post.content_hash,
+                                                  thumbnail_url=post.thumbnail_url, parsed_content=post.parsed_content)
+                if build_phase == 'process':
+                    # Entri manifest postingan (tanpa daftar output) ditambah isi yang sudah dioptimalkan
+                    shard_posts[post.id] = {key: value for key, value in post_entry.items() if key != 'outputs'}
+                    shard_posts[post.id]['body'] = post.optimized_content
+                if streaming_build:
+                    # Fase process tidak menyimpan isi ke post store: salinan per job ini dibuang, isinya
+                    # dibawa lewat partial dan disimpan di fase merge (lihat shards.py)
+                    if post.optimized_content is not None and build_phase != 'process':
+                        post_store.put_body(post.id, post.content_hash, post.optimized_content)
+                        stored_body_count += 1
+                    post.content = None
+                    post.optimized_content = None
                 
-                # Pastikan tanggal 'published' ada dan valid untuk sorting
-                if 'published' in post:
-                    fully_processed_posts.append(post)
-
-                labels = post.get('labels', [])
-                if labels:
-                    for label in labels:
-                        all_labels.add(label)
-                        label_slug = slugify(label)
-                        if label_slug not in posts_by_label:
-                            posts_by_label[label_slug] = {
-                                'name': label,
-                                'slug': label_slug,
-                                'posts': []
-                            }
-                        posts_by_label[label_slug]['posts'].append(post)
+                fully_processed_posts.append(post)
+                all_labels.update(post.labels)
+                stats.record_item('process', post.detail_url, time.perf_counter() - post_start)
+
+            # Isi postingan harus sudah tersimpan sebelum worker render membacanya
+            post_store.commit()
+            post_store.close()
+            print(f"Processed {len(fully_processed_posts)} posts ({reused_count} unchanged, reused from build manifest).")
+            stats.count('posts', len(fully_processed_posts))
+            stats.count('posts_reused', reused_count)
+            if streaming_build:
+                print(f"Build streaming: {stored_body_count} isi postingan disimpan ke post store, dimuat lagi saat dirender.")
+
+            if build_phase == 'process':
+                partial = write_partial(shard_dir, 'process', shard_index, shard_count, {'posts': shard_posts})
+                print(f"Shard {shard_index}/{shard_count}: partial fase process ditulis ke {partial}.")
+                return
 
             # --- BARIS BARU UNTUK MENGURUTKAN DAN MENGAMBIL POSTINGAN TERBARU ---
             # Urutkan semua postingan berdasarkan tanggal publikasi (terbaru dulu)
             # Pastikan 'published' ada di setiap post sebelum sorting
-            fully_processed_posts.sort(key=lambda p: datetime.fromisoformat(p['published'].replace('Z', '+00:00')), reverse=True)
+            fully_processed_posts.sort(key=lambda p: p.published, reverse=True)
             
             # Ambil 5 postingan terbaru (Anda bisa ubah angka ini)
             num_recent_posts_widget = 5
@@ -267,175 +781,380 @@ def main():
             print(f"Collected {len(recent_posts_for_widget)} recent posts for the widget.")
             # --- AKHIR BARIS BARU ---
 
+            # --- INVERTED INDEX LABEL ---
+            stats.begin('related')
+            # Posting list tiap label sudah terurut terbaru dulu, dipakai ulang oleh related posts,
+            # halaman kategori dan sitemap tanpa perlu mengurutkan ulang.
+            posts_by_label = build_label_index(fully_processed_posts)
+            post_rank = {post.id: rank for rank, post in enumerate(fully_processed_posts)}
+            num_related_posts = get_setting('RELATED_POSTS_COUNT', 5)
+            related_scan_limit = get_setting('RELATED_POSTS_SCAN_LIMIT', 500)
+
+            sorted_labels = sorted(list(all_labels))
+            current_year = datetime.now().year
+
+            # Fingerprint "kartu" postingan: field yang dipakai di listing, related posts dan sidebar.
+            post_cards = {post.id: post.card() for post in fully_processed_posts}
+            card_fingerprints = {
+                post_id: fingerprint(*card.fingerprint_parts()) for post_id, card in post_cards.items()
+            }
+
+            # --- MODE PAGINASI ---
+            # PAGINATION_MODE=newest (default): halaman dihitung dari postingan terbaru, setiap postingan baru
+            # menggeser isi semua halaman listing. 'stable' (arsip dinomori dari postingan terlama) dan 'month'
+            # (arsip per bulan) membuat halaman arsip lama tidak berubah; widget "Artikel Terbaru" lalu dimuat
+            # dari recent-posts.json supaya postingan baru juga tidak mengubah sidebar di semua halaman.
+            pagination_mode = get_setting('PAGINATION_MODE', 'newest')
+            if pagination_mode not in PAGINATION_MODES:
+                raise ValueError(f"PAGINATION_MODE harus salah satu dari {', '.join(PAGINATION_MODES)}, bukan '{pagination_mode}'.")
+            posts_per_page = 5 # Jumlah postingan per halaman INDEX utama
+            index_pages = paginate_listing(fully_processed_posts, posts_per_page, '/', lambda key: f'/pages/{key}.html',
+                                           mode=pagination_mode)
+            # Data halaman listing untuk sitemap
+            listing_pages = []
+
+            # Konteks bersama (sidebar & footer) untuk index, kategori dan halaman postingan
+            shared_context = {
+                'all_labels': sorted_labels,
+                'current_year': current_year,
+            }
+            if image_profiles:
+                shared_context['image_profiles'] = image_profiles
+            if pagination_mode == 'newest':
+                shared_context['recent_posts'] = [post_cards[p.id] for p in recent_posts_for_widget]
+            else:
+                shared_context['recent_posts_url'] = '/recent-posts.json'
+            if pagination_mode == 'month':
+                shared_context['archive_months'] = [{'label': month_label(pagination['current_page']), 'url': page_url}
+                                                    for page_url, _, pagination in index_pages[1:]]
+
+            # PENTING: GANTI INI DENGAN DOMAIN SITUS ANDA!
+            # Contoh untuk GitHub Pages: "https://ceritagetar.github.io"
+            # Jika menggunakan custom domain, gunakan custom domain Anda: "https://www.yourdomain.com"
+            your_website_base_url = "https://ceritagetar.github.io" # <--- GANTI INI!
+
+            # --- PIPELINE ASET ---
+            # ASSET_PIPELINE=1: HTML/CSS/JS diminifikasi, style.css dan script/*.js dilayani dari /assets/ dengan
+            # nama ber-hash, dan CSS kritis per template di-inline (CRITICAL_CSS=0 untuk menonaktifkan).
+            # PRECOMPRESS=gz,br menulis salinan .gz/.br setiap halaman dan aset. Pipeline berjalan di worker render,
+            # jadi hanya halaman yang dirender ulang yang diproses.
+            template_fingerprint = templates_fingerprint(template_dir)
+            asset_pipeline = None
+            precompress = parse_precompress(get_setting('PRECOMPRESS', ''))
+            if get_setting('ASSET_PIPELINE', False) or precompress:
+                asset_pipeline = AssetPipeline(os.path.dirname(os.path.abspath(__file__)), your_website_base_url,
+                                               enabled=get_setting('ASSET_PIPELINE', False),
+                                               critical_css=get_setting('CRITICAL_CSS', True),
+                                               precompress=precompress)
+                asset_pipeline.load_assets()
+                # CSS kritis disimpan di manifest; dihitung ulang hanya jika stylesheet atau template berubah
+                critical_css_key = fingerprint(asset_pipeline.stylesheet, template_fingerprint)
+                cached_critical_css = manifest.state.get('critical_css', {})
+                if cached_critical_css.get('key') == critical_css_key:
+                    asset_pipeline.critical_css = dict(cached_critical_css['templates'])
+
+            # Input yang sama untuk SEMUA halaman (template, sidebar, footer). Jika berubah, semua halaman dirender ulang.
+            global_fingerprint = fingerprint(
+                template_fingerprint,
+                current_year,
+                sorted_labels,
+                pagination_mode,
+                [card_fingerprints[p.id] for p in recent_posts_for_widget] if pagination_mode == 'newest' else None,
+                shared_context.get('archive_months'),
+                asset_pipeline.fingerprint_parts() if asset_pipeline else None,
+                image_profiles,
+            )
 
             # --- GENERASI HALAMAN INDIVIDUAL POSTINGAN & MENCARI RELATED POSTS ---
             for post in fully_processed_posts:  # Gunakan fully_processed_posts yang sudah diurutkan
-                post_slug = slugify(post.get('title', 'untitled-post'))
-                post_filename = f"{post_slug}.html"
+                post_filename = f"{post.slug}.html"
 
-                related_posts = []
-                current_post_labels = set(post.get('labels', []))
-                
-                if current_post_labels:  
-                    for other_post in fully_processed_posts:
-                        if other_post['id'] != post['id'] and \
-                           len(set(other_post.get('labels', [])) & current_post_labels) > 0:
-                            related_posts.append(other_post)
-                            
-                        if len(related_posts) >= 5:  
-                            break
-                    
-                post['related_posts'] = related_posts
-
-                single_post_html = single_post_template.render(
-                    post=post,
-                    all_labels=sorted(list(all_labels)),  
-                    current_year=datetime.now().year,
-                    # --- TERUSKAN RECENT_POSTS KE SINGLE_POST_TEMPLATE JUGA ---
-                    recent_posts=recent_posts_for_widget  
+                # Related posts: diurutkan berdasarkan jumlah label yang sama, lalu tanggal terbaru
+                related_posts = find_related_posts(post, posts_by_label, post_rank,
+                                                   max_related=num_related_posts, scan_limit=related_scan_limit)
+                post.related_posts = [post_cards[p.id] for p in related_posts]
+
+                post_fingerprint = fingerprint(
+                    global_fingerprint,
+                    card_fingerprints[post.id],
+                    post.content_hash,
+                    [card_fingerprints[p.id] for p in related_posts],
                 )
-                
-                single_post_file_path = os.path.join(output_dir, post_filename)
-                with open(single_post_file_path, "w", encoding="utf-8") as f:
-                    f.write(single_post_html)
-                print(f"Generated: {single_post_file_path}")
+                manifest.add_output(post.id, post_filename)
+                queue_page('post', post_filename, post_fingerprint, 'single_post_template.html', {'post': post})
             
             # --- PAGINASI UNTUK HALAMAN UTAMA (index.html dan pages/*.html) ---
-            posts_per_page = 5 # Jumlah postingan per halaman INDEX utama
+            stats.begin('paginate')
             total_posts = len(fully_processed_posts)
-            total_pages = math.ceil(total_posts / posts_per_page)
-
-            print(f"Total posts: {total_posts}, Posts per page (Index): {posts_per_page}, Total pages (Index): {total_pages}")
-
-            for page_num in range(1, total_pages + 1):
-                start_index = (page_num - 1) * posts_per_page
-                end_index = start_index + posts_per_page
-                current_page_posts = fully_processed_posts[start_index:end_index]
-
-                page_context = {
-                    'posts': current_page_posts,
-                    'current_page': page_num,
-                    'total_pages': total_pages,
-                    'all_labels': sorted(list(all_labels)),  
-                    'current_year': datetime.now().year,
-                    # --- TERUSKAN RECENT_POSTS KE INDEX_TEMPLATE (dan pages/*.html) ---
-                    'recent_posts': recent_posts_for_widget  
-                }
 
-                if page_num > 1:
-                    page_context['prev_page_url'] = '/' if page_num == 2 else f'/pages/{page_num - 1}.html'
-                else:
-                    page_context['prev_page_url'] = None
+            print(f"Total posts: {total_posts}, Posts per page (Index): {posts_per_page}, Total pages (Index): {len(index_pages)}")
 
-                if page_num < total_pages:
-                    page_context['next_page_url'] = f'/pages/{page_num + 1}.html'
-                else:
-                    page_context['next_page_url'] = None
-                
-                rendered_page_html = list_posts_template.render(page_context)
-                
-                if page_num == 1:
-                    index_file_path = os.path.join(output_dir, 'index.html')
-                    with open(index_file_path, "w", encoding="utf-8") as f:
-                        f.write(rendered_page_html)
-                    print(f"Generated: {index_file_path} (Page 1)")
-                else:
-                    page_filename = f"{page_num}.html"
-                    page_file_path = os.path.join(pages_output_dir, page_filename)
-                    with open(page_file_path, "w", encoding="utf-8") as f:
-                        f.write(rendered_page_html)
-                    print(f"Generated: {page_file_path} (Page {page_num})")
+            for page_url, current_page_posts, pagination in index_pages:
+                page_context = dict(pagination, posts=[post_cards[p.id] for p in current_page_posts])
+                page_rel_path = 'index.html' if page_url == '/' else page_url.lstrip('/')
+                page_fingerprint = fingerprint(
+                    global_fingerprint, pagination,
+                    [card_fingerprints[p.id] for p in current_page_posts],
+                )
+                for p in current_page_posts:
+                    manifest.add_output(p.id, page_rel_path)
+                queue_page('index', page_rel_path, page_fingerprint, 'index_template.html', page_context)
+                listing_lastmod_post = fully_processed_posts[0] if pagination_mode == 'newest' else current_page_posts[0]
+                listing_pages.append({'stage': 'index', 'url': page_url, 'first': page_url == '/',
+                                      'lastmod': listing_lastmod_post.published.strftime('%Y-%m-%d')})
             
             # --- GENERASI HALAMAN DETAIL KATEGORI (DENGAN PAGINASI UNTUK TIAP KATEGORI) ---
             posts_per_category_page = 5 # Jumlah postingan per halaman KATEGORI
 
             for label_slug, label_info in posts_by_label.items():
-                # Pastikan postingan di kategori juga diurutkan berdasarkan tanggal terbaru
-                category_posts = sorted(label_info['posts'], key=lambda p: datetime.fromisoformat(p['published'].replace('Z', '+00:00')), reverse=True)
-                total_category_posts = len(category_posts)
-                total_category_pages = math.ceil(total_category_posts / posts_per_category_page)
+                # Posting list dari inverted index sudah terurut berdasarkan tanggal terbaru
+                category_posts = label_info['posts']
+                # Halaman pertama kategori disimpan di kategori/nama-slug.html,
+                # halaman berikutnya/arsip di kategori/nama-slug/page/X.html
+                category_pages = paginate_listing(
+                    category_posts, posts_per_category_page, f'/kategori/{label_slug}.html',
+                    lambda key, label_slug=label_slug: f'/kategori/{label_slug}/page/{key}.html', mode=pagination_mode)
 
-                print(f"Generating pages for category '{label_info['name']}': Total posts {total_category_posts}, Total pages {total_category_pages}")
+                for page_url, current_category_page_posts, pagination in category_pages:
+                    # Konteks untuk template kategori
+                    category_detail_context = dict(
+                        pagination,
+                        label_name=label_info['name'],
+                        label_slug=label_slug, # Tambahkan label_slug ke konteks agar bisa dipakai di template
+                        posts=[post_cards[p.id] for p in current_category_page_posts],
+                    )
+                    category_rel_path = page_url.lstrip('/')
 
-                # Buat folder untuk sub-paginasi kategori jika diperlukan (misal: kategori/nama-slug/page/)
-                category_slug_dir = os.path.join(categories_output_dir, label_slug)
-                os.makedirs(category_slug_dir, exist_ok=True)
+                    category_fingerprint = fingerprint(
+                        global_fingerprint, label_info['name'], label_slug, pagination,
+                        [card_fingerprints[p.id] for p in current_category_page_posts],
+                    )
+                    for p in current_category_page_posts:
+                        manifest.add_output(p.id, category_rel_path)
+                    queue_page('kategori', category_rel_path, category_fingerprint,
+                               'category_detail_template.html', category_detail_context)
+                    listing_lastmod_post = category_posts[0] if pagination_mode == 'newest' else current_category_page_posts[0]
+                    listing_pages.append({'stage': 'kategori', 'url': page_url, 'first': page_url == f'/kategori/{label_slug}.html',
+                                          'lastmod': listing_lastmod_post.published.strftime('%Y-%m-%d')})
 
+            print(f"Total categories: {len(posts_by_label)}")
 
-                for page_num in range(1, total_category_pages + 1):
-                    start_index = (page_num - 1) * posts_per_category_page
-                    end_index = start_index + posts_per_category_page
-                    current_category_page_posts = category_posts[start_index:end_index]
+            # --- RENDER SEMUA HALAMAN YANG BERUBAH ---
+            stats.begin('render')
+            stage_counts = {stage: [0, 0] for stage in ('post', 'index', 'kategori')}
+            render_jobs = []
+            # Build terpartisi: fase render hanya merender halaman milik shard ini (shard_pages mencatat fingerprint
+            # dan hash-nya untuk partial), fase merge mengambil halaman milik shard dari partial fase render.
+            shard_pages = {}
+            shard_critical_css = {}
+            if build_phase == 'merge':
+                rendered_shard_pages, shard_critical_css = load_rendered_pages(shard_dir, shard_count)
+            for rel_path, (stage, page_fingerprint, template_name, context) in page_queue.items():
+                page_shard = page_owner_shard(stage, context, shard_count) if shard_count else None
+                if build_phase == 'render' and page_shard != shard_index:
+                    continue
+                if build_phase == 'merge' and page_shard is not None:
+                    rendered_page = rendered_shard_pages.get(rel_path)
+                    if rendered_page is None or rendered_page[0] != page_fingerprint:
+                        raise ValueError(f"Halaman {rel_path} tidak ada atau tidak cocok di partial fase render "
+                                         f"shard {page_shard}/{shard_count}; jalankan ulang fase render.")
+                    if not os.path.exists(os.path.join(output_dir, rel_path)):
+                        raise ValueError(f"File {rel_path} dari shard {page_shard}/{shard_count} belum disalin ke output.")
+                    manifest.record_page(rel_path, page_fingerprint)
+                    if rendered_page[1]:
+                        manifest.record_output_hash(rel_path, rendered_page[1])
+                    for fmt in (asset_pipeline.precompress if asset_pipeline else ()):
+                        manifest.record_page(f"{rel_path}.{fmt}", page_fingerprint)
+                    shard_pages[rel_path] = rendered_page
+                    continue
+                if build_phase == 'render':
+                    shard_pages[rel_path] = [page_fingerprint, manifest.output_hashes.get(rel_path)]
+                if manifest.needs_render(rel_path, page_fingerprint):
+                    render_jobs.append((rel_path, template_name, context, manifest.output_hashes.get(rel_path)))
+                    stage_counts[stage][0] += 1
+                else:
+                    stage_counts[stage][1] += 1
+                manifest.record_page(rel_path, page_fingerprint)
+                for fmt in (asset_pipeline.precompress if asset_pipeline else ()):
+                    manifest.record_page(f"{rel_path}.{fmt}", page_fingerprint)
+
+            # Halaman contoh (pertama di antrian) untuk CSS kritis template yang dirender tapi belum punya CSS kritis
+            critical_samples = {}
+            if asset_pipeline is not None:
+                rendered_templates = {job[1] for job in render_jobs}
+                for stage, page_fingerprint, template_name, context in page_queue.values():
+                    if template_name in rendered_templates and asset_pipeline.needs_critical_css(template_name):
+                        critical_samples.setdefault(template_name, context)
+
+            # Template di-compile menjadi modul Python sekali per versi template (PRECOMPILED_TEMPLATES=0 untuk
+            # memakai bytecode cache Jinja biasa). Tidak dilakukan sama sekali jika tidak ada halaman yang dirender.
+            compiled_template_dir = None
+            if render_jobs and get_setting('PRECOMPILED_TEMPLATES', True):
+                compiled_template_dir = precompile_templates(
+                    template_dir, os.path.join(output_dir, BUILD_CACHE_DIR, 'templates'), template_fingerprint)
+
+            print(f"Rendering {len(render_jobs)} pages with {render_workers} worker(s)...")
+            render_results = render_pages(render_jobs, template_dir, output_dir, shared_context, workers=render_workers,
+                                          bytecode_cache_dir=os.path.join(output_dir, BUILD_CACHE_DIR, 'jinja'),
+                                          post_store_path=post_store_path if streaming_build else None,
+                                          asset_pipeline=asset_pipeline, critical_samples=critical_samples,
+                                          compiled_template_dir=compiled_template_dir)
+            # Semua penulisan file (halaman, sitemap, penghapusan) lewat OutputWriter
+            output_writer = OutputWriter(output_dir, manifest.output_hashes)
+            verbose = get_setting('VERBOSE', False)
+            for rel_path, output_hash, written, render_seconds in render_results:
+                stats.add_render_time(page_queue[rel_path][2], render_seconds)
+                stats.record_item('render', rel_path, render_seconds)
+                manifest.record_output_hash(rel_path, output_hash)
+                if rel_path in shard_pages:
+                    shard_pages[rel_path][1] = output_hash
+                if written:
+                    output_writer.written += 1
+                    # Daftar file per halaman hanya dicetak jika VERBOSE=1
+                    if verbose:
+                        print(f"Generated: {os.path.join(output_dir, rel_path)}")
+                else:
+                    output_writer.skipped += 1
+            if asset_pipeline is not None and build_phase != 'render':
+                if asset_pipeline.critical_css_enabled:
+                    # Fase merge: CSS kritis template yang hanya dirender di shard diambil dari partial fase render
+                    for template_name, css in shard_critical_css.items():
+                        asset_pipeline.critical_css.setdefault(template_name, css)
+                    manifest.state['critical_css'] = {'key': critical_css_key, 'templates': asset_pipeline.critical_css}
+                # Aset ber-hash: nama file berubah jika isinya berubah, file lama terhapus sebagai file yatim
+                assets_written = 0
+                for rel_path, data in asset_pipeline.output_files():
+                    asset_fingerprint = content_hash(data)
+                    manifest.record_page(rel_path, asset_fingerprint)
+                    if manifest.needs_render(rel_path, asset_fingerprint):
+                        assets_written += output_writer.write(rel_path, data)
+                        manifest.record_output_hash(rel_path, output_writer.hashes[rel_path])
+                print(f"Pipeline aset: {len(asset_pipeline.assets)} aset, {assets_written} file aset ditulis, "
+                      f"CSS kritis dihitung untuk {len(critical_samples)} template.")
+            for stage, stage_name in (('post', 'Halaman postingan'), ('index', 'Halaman index'), ('kategori', 'Halaman kategori')):
+                print(f"{stage_name}: {stage_counts[stage][0]} dirender, {stage_counts[stage][1]} tidak berubah")
+                stats.count(f'pages_{stage}_rendered', stage_counts[stage][0])
+                stats.count(f'pages_{stage}_unchanged', stage_counts[stage][1])
+
+            if build_phase == 'render':
+                # Manifest dan bagian global (sitemap, index pencarian, aset) ditulis di fase merge
+                precompress_formats = asset_pipeline.precompress if asset_pipeline else ()
+                shard_files = [path for rel_path in shard_pages
+                               for path in [rel_path] + [f"{rel_path}.{fmt}" for fmt in precompress_formats]]
+                partial = write_partial(
+                    shard_dir, 'render', shard_index, shard_count,
+                    {'pages': shard_pages,
+                     'critical_css': asset_pipeline.critical_css if asset_pipeline and asset_pipeline.critical_css_enabled else {}},
+                    files=shard_files)
+                print(f"Shard {shard_index}/{shard_count}: {len(shard_pages)} halaman, partial fase render ditulis ke {partial}.")
+                return
+            if build_phase == 'merge':
+                print(f"Halaman dari {shard_count} shard: {len(shard_pages)} (dirender di fase render).")
 
-                    # Konteks untuk template kategori
-                    category_detail_context = {
-                        'label_name': label_info['name'],
-                        'label_slug': label_slug, # Tambahkan label_slug ke konteks agar bisa dipakai di template
-                        'posts': current_category_page_posts,
-                        'current_page': page_num,
-                        'total_pages': total_category_pages,
-                        'all_labels': sorted(list(all_labels)),
-                        'current_year': datetime.now().year,
-                        # --- TERUSKAN RECENT_POSTS KE CATEGORY_DETAIL_TEMPLATE JUGA ---
-                        'recent_posts': recent_posts_for_widget  
-                    }
-
-                    # Atur URL paginasi untuk kategori
-                    if page_num > 1:
-                        # Link "Prev" akan mengarah ke root kategori jika ini halaman 2 (misal: /kategori/teknologi.html)
-                        # atau ke subfolder 'page/X.html' jika halaman > 2 (misal: /kategori/teknologi/page/2.html)
-                        category_detail_context['prev_page_url'] = \
-                            f'/kategori/{label_slug}.html' if page_num == 2 else f'/kategori/{label_slug}/page/{page_num - 1}.html'
-                    else:
-                        category_detail_context['prev_page_url'] = None
-
-                    if page_num < total_category_pages:
-                        category_detail_context['next_page_url'] = f'/kategori/{label_slug}/page/{page_num + 1}.html'
-                    else:
-                        category_detail_context['next_page_url'] = None
-                    
-                    # Render HTML kategori
-                    category_detail_html = category_detail_template.render(category_detail_context)
-                    
-                    # Tentukan path file output
-                    if page_num == 1:
-                        # Halaman pertama kategori akan disimpan di kategori/nama-slug.html
-                        category_file_path = os.path.join(categories_output_dir, f"{label_slug}.html")
-                    else:
-                        # Halaman paginasi kategori akan disimpan di kategori/nama-slug/page/X.html
-                        # Pastikan folder 'page' dibuat jika belum ada
-                        category_page_dir = os.path.join(category_slug_dir, 'page')
-                        os.makedirs(category_page_dir, exist_ok=True)
-                        category_file_path = os.path.join(category_page_dir, f"{page_num}.html")
-                    
-                    with open(category_file_path, "w", encoding="utf-8") as f:
-                        f.write(category_detail_html)
-                    print(f"Generated: {category_file_path} (Category '{label_info['name']}' Page {page_num})")
-            
             # --- GENERATE SITEMAP ---
-            # PENTING: GANTI INI DENGAN DOMAIN SITUS ANDA!
-            # Contoh untuk GitHub Pages: "https://ceritagetar.github.io"
-            # Jika menggunakan custom domain, gunakan custom domain Anda: "https://www.yourdomain.com"
-            your_website_base_url = "https://ceritagetar.github.io" # <--- GANTI INI!
-            
-            generate_sitemap(
-                processed_posts=fully_processed_posts,
-                all_labels=all_labels,
-                total_main_pages=total_pages, # total_pages dari paginasi halaman utama
-                posts_per_main_page=posts_per_page, # posts_per_page dari paginasi halaman utama
-                posts_by_label=posts_by_label,
-                base_url=your_website_base_url
+            stats.begin('sitemap')
+            sitemap_max_urls = get_setting('SITEMAP_MAX_URLS', SITEMAP_MAX_URLS)
+            sitemap_max_bytes = get_setting('SITEMAP_MAX_BYTES', SITEMAP_MAX_BYTES)
+            sitemap_gzip = get_setting('SITEMAP_GZIP', False)
+
+            # Sitemap hanya bergantung pada URL dan tanggal postingan, halaman listing (dan pengaturan sitemap).
+            sitemap_fingerprint = fingerprint(
+                your_website_base_url, listing_pages, sitemap_max_urls, sitemap_max_bytes, sitemap_gzip,
+                [(p.id, p.detail_url, p.lastmod.isoformat(), p.published.isoformat(), p.labels) for p in fully_processed_posts],
             )
+            # Jumlah file sitemap baru diketahui setelah ditulis, jadi daftar file build sebelumnya disimpan di manifest
+            previous_sitemap_files = manifest.state.get('sitemap_files', [])
+            if previous_sitemap_files and not any(manifest.needs_render(rel_path, sitemap_fingerprint)
+                                                  for rel_path in previous_sitemap_files):
+                for rel_path in previous_sitemap_files:
+                    manifest.record_page(rel_path, sitemap_fingerprint)
+                print("Sitemap tidak berubah, dilewati.")
+            else:
+                sitemap_files = generate_sitemap(
+                    processed_posts=fully_processed_posts,
+                    listing_pages=listing_pages,
+                    base_url=your_website_base_url,
+                    writer=output_writer,
+                    max_urls=sitemap_max_urls,
+                    max_bytes=sitemap_max_bytes,
+                    compress=sitemap_gzip,
+                    stats=stats
+                )
+                for rel_path in sitemap_files:
+                    manifest.record_page(rel_path, sitemap_fingerprint)
+                    manifest.record_output_hash(rel_path, output_writer.hashes[rel_path])
+                manifest.state['sitemap_files'] = sitemap_files
+
+            # --- DAFTAR ARTIKEL TERBARU (paginasi stabil, dibaca script/recent-posts.js) ---
+            if pagination_mode != 'newest':
+                recent_posts_json = json.dumps(
+                    [{'title': p.title, 'url': p.detail_url} for p in recent_posts_for_widget],
+                    ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+                recent_posts_fingerprint = content_hash(recent_posts_json)
+                manifest.record_page('recent-posts.json', recent_posts_fingerprint)
+                if manifest.needs_render('recent-posts.json', recent_posts_fingerprint):
+                    output_writer.write('recent-posts.json', recent_posts_json)
+                    manifest.record_output_hash('recent-posts.json', output_writer.hashes['recent-posts.json'])
+
+            # --- INDEX PENCARIAN (untuk overlay #searchfs) ---
+            stats.begin('search_index')
+            # Shard diberi nama berdasarkan hash isinya, jadi hanya shard yang berubah yang ditulis;
+            # shard lama otomatis terhapus sebagai file yatim. Set SEARCH_INDEX=0 untuk menonaktifkan.
+            if get_setting('SEARCH_INDEX', True):
+                doc_numbers = assign_doc_numbers(fully_processed_posts, manifest.state.get('search_doc_numbers', {}))
+                manifest.state['search_doc_numbers'] = doc_numbers
+                search_files = build_search_index(fully_processed_posts, doc_numbers,
+                                                  shard_budget=get_setting('SEARCH_SHARD_MAX_BYTES', 16384))
+                search_written = 0
+                for rel_path, data in search_files.items():
+                    if isinstance(data, str):
+                        data = data.encode('utf-8')
+                    search_fingerprint = content_hash(data)
+                    manifest.record_page(rel_path, search_fingerprint)
+                    if manifest.needs_render(rel_path, search_fingerprint):
+                        search_written += output_writer.write(rel_path, data)
+                        manifest.record_output_hash(rel_path, output_writer.hashes[rel_path])
+                print(f"Index pencarian: {len(search_files)} file, {search_written} ditulis.")
+
+            # --- HAPUS HALAMAN YATIM ---
+            stats.begin('cleanup')
+            # Halaman dari build sebelumnya yang tidak dihasilkan lagi (postingan/label dihapus,
+            # judul diganti, jumlah halaman berkurang) dihapus dari output.
+            output_writer.remove(manifest.orphaned_pages())
+
+            manifest.save()
+            if build_phase == 'merge':
+                remove_partials(shard_dir, shard_count)
+            stats.count('files_written', output_writer.written)
+            stats.count('files_unchanged', output_writer.skipped)
+            stats.count('files_removed', output_writer.removed)
+            print(f"Build selesai: {output_writer.summary()} (halaman yang inputnya tidak berubah tidak dirender).")
 
         else:
             print("No posts found or an error occurred. No HTML files generated.")
 
+    # Setiap error menghentikan proses dengan exit code bukan 0, supaya CI tidak men-deploy hasil build yang gagal
+    # (laporan waktu di blok finally tetap ditulis).
     except FileNotFoundError as e:
         print(f"Error: {e}. Make sure 'templates' folder and template files exist in the correct location.")
+        stats.error = str(e)
+        sys.exit(1)
     except ValueError as e:
         print(f"Configuration error: {e}")
+        stats.error = str(e)
+        sys.exit(1)
     except Exception as e:
         print(f"An unexpected error occurred: {e}")
+        stats.error = str(e)
+        sys.exit(1)
+    finally:
+        build_report = stats.report()
+        if build_report['stages']:
+            print("Waktu per tahap: " + ", ".join(f"{name} {entry['wall_seconds']:.1f}s"
+                                                  for name, entry in build_report['stages'].items()))
+        build_report_path = get_setting('BUILD_REPORT')
+        if build_report_path:
+            stats.save(build_report_path)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,136 @@
+# manifest.py
+# Manifest build persisten untuk rebuild inkremental.
+import os
+import json
+import hashlib
+
+MANIFEST_VERSION = 2
+
+
+def fingerprint(*parts):
+    """
+    Menghasilkan hash stabil (sha1 hex) dari data apa pun yang bisa di-serialize ke JSON.
+    Dipakai untuk mendeteksi apakah input sebuah halaman berubah sejak build terakhir.
+    """
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def templates_fingerprint(template_dir):
+    """
+    Hash gabungan seluruh file template. Jika satu template berubah, semua halaman dianggap berubah.
+    """
+    digest = hashlib.sha1()
+    for root, _dirs, files in sorted(os.walk(template_dir)):
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            digest.update(os.path.relpath(path, template_dir).encode('utf-8'))
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+class BuildManifest:
+    """
+    Menyimpan status build sebelumnya: data tiap postingan (id, updated, hash konten,
+    hasil olahan HTML dan file output yang disentuhnya), fingerprint input tiap halaman output
+    dan hash isi file yang terakhir ditulis.
+    """
+
+    def __init__(self, path, output_dir):
+        self.path = path
+        self.output_dir = output_dir
+        self.posts = {}
+        self.pages = {}
+        self.output_hashes = {}
+        self._new_posts = {}
+        self._new_pages = {}
+        self._new_output_hashes = {}
+        # Data tambahan yang perlu bertahan antar build (misalnya nomor dokumen index pencarian)
+        self.state = {}
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Manifest build tidak bisa dibaca, melakukan full rebuild: {e}")
+            return
+        if data.get('version') != MANIFEST_VERSION:
+            return
+        self.posts = data.get('posts', {})
+        self.pages = data.get('pages', {})
+        self.output_hashes = data.get('output_hashes', {})
+        self.state = data.get('state', {})
+
+    def reset(self):
+        """
+        Lupakan hasil build sebelumnya (full rebuild). Daftar file output tetap diingat,
+        supaya file yatim masih bisa dibersihkan dan file yang isinya sama tidak ditulis ulang.
+        """
+        self.posts = {}
+        self.pages = dict.fromkeys(self.pages)
+
+    # --- Postingan ---
+    def cached_post(self, post_id, updated, content_hash):
+        """
+        Mengembalikan entri postingan dari build sebelumnya jika id, 'updated' dan hash kontennya
+        masih sama, selain itu None.
+        """
+        entry = self.posts.get(post_id)
+        if entry and entry.get('updated') == updated and entry.get('hash') == content_hash:
+            return entry
+        return None
+
+    def record_post(self, post_id, updated, content_hash, **derived):
+        entry = {'updated': updated, 'hash': content_hash, 'outputs': []}
+        entry.update(derived)
+        self._new_posts[post_id] = entry
+        return entry
+
+    def add_output(self, post_id, rel_path):
+        entry = self._new_posts.get(post_id)
+        if entry is not None:
+            entry['outputs'].append(rel_path)
+
+    # --- Halaman output ---
+    def needs_render(self, rel_path, page_fingerprint):
+        """
+        True jika halaman harus dirender ulang: fingerprint inputnya berubah
+        atau file-nya tidak ada di disk.
+        """
+        if self.pages.get(rel_path) != page_fingerprint:
+            return True
+        return not os.path.exists(os.path.join(self.output_dir, rel_path))
+
+    def record_page(self, rel_path, page_fingerprint):
+        self._new_pages[rel_path] = page_fingerprint
+        if rel_path in self.output_hashes:
+            self._new_output_hashes[rel_path] = self.output_hashes[rel_path]
+
+    def record_output_hash(self, rel_path, output_hash):
+        self._new_output_hashes[rel_path] = output_hash
+
+    def orphaned_pages(self):
+        """File output build sebelumnya yang tidak dihasilkan lagi di build ini."""
+        return [rel_path for rel_path in self.pages if rel_path not in self._new_pages]
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        data = {
+            'version': MANIFEST_VERSION,
+            'posts': self._new_posts,
+            'pages': self._new_pages,
+            'output_hashes': self._new_output_hashes,
+            'state': self.state,
+        }
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self.posts = self._new_posts
+        self.pages = self._new_pages
+        self.output_hashes = self._new_output_hashes
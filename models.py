@@ -0,0 +1,75 @@
+# models.py
+# Model data postingan yang ringkas. Tanggal di-parse dan slug dihitung sekali saat postingan dibuat.
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+from utils import slugify, parse_timestamp
+
+
+@dataclass(slots=True)
+class PostCard:
+    """
+    Versi ringan postingan untuk listing, sidebar dan related posts
+    (murah dikirim ke worker render).
+    """
+    id: str
+    title: str
+    detail_url: str
+    thumbnail_url: Optional[str]
+    parsed_content: str
+    labels: tuple
+    published: datetime
+
+    def fingerprint_parts(self):
+        return (self.id, self.title, self.detail_url, self.thumbnail_url,
+                self.parsed_content, self.labels, self.published.isoformat())
+
+
+@dataclass(slots=True)
+class Post:
+    """
+    Postingan Blogger yang sudah dibersihkan: hanya field yang dibutuhkan build dan template.
+    Field mentah API lainnya (author, blog, replies, selfLink, dll.) tidak disimpan.
+    """
+    id: str
+    title: str
+    published: datetime
+    updated: Optional[datetime]
+    labels: tuple
+    content: Optional[str]
+    slug: str
+    detail_url: str
+    label_slugs: tuple
+    # Hasil pengolahan HTML (diisi di main)
+    content_hash: Optional[str] = None
+    thumbnail_url: Optional[str] = None
+    parsed_content: str = ""
+    optimized_content: Optional[str] = None
+    related_posts: list = field(default_factory=list)
+
+    @classmethod
+    def from_blogger(cls, item):
+        """Membuat Post dari item JSON posts.list Blogger (harus punya 'published')."""
+        labels = tuple(item.get('labels', ()))
+        slug = slugify(item.get('title', 'untitled-post'))
+        return cls(
+            id=item['id'],
+            title=item.get('title', ''),
+            published=parse_timestamp(item['published']),
+            updated=parse_timestamp(item['updated']) if item.get('updated') else None,
+            labels=labels,
+            content=item.get('content', ''),
+            slug=slug,
+            # Gunakan slug sebagai URL file lokal (bukan URL asli Blogger)
+            detail_url=f"/{slug}.html",
+            label_slugs=tuple(slugify(label) for label in labels),
+        )
+
+    @property
+    def lastmod(self):
+        """Tanggal perubahan terakhir (updated, atau published jika tidak ada)."""
+        return self.updated or self.published
+
+    def card(self):
+        return PostCard(self.id, self.title, self.detail_url, self.thumbnail_url,
+                        self.parsed_content, self.labels, self.published)
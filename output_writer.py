@@ -0,0 +1,172 @@
+# output_writer.py
+# Lapisan penulisan file output: lewati file yang isinya tidak berubah, tulis secara atomik,
+# dan hapus halaman yatim (orphan) dari build sebelumnya.
+import os
+import hashlib
+import tempfile
+
+# Umask proses, supaya file hasil mkstemp (selalu 0600) mendapat permission seperti open() biasa
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def content_hash(data):
+    return hashlib.sha1(data).hexdigest()
+
+
+class OutputWriter:
+    """
+    Menulis file output relatif terhadap output_dir.
+
+    File hanya ditulis jika hash isinya berbeda dari yang sudah ada (dicek lewat hash di manifest
+    atau langsung dari file di disk), sehingga mtime dan riwayat git tidak berubah tanpa alasan.
+    File yang berubah ditulis ke file sementara lalu di-rename, jadi tidak pernah ada file setengah jadi.
+    """
+
+    def __init__(self, output_dir, known_hashes=None):
+        self.output_dir = output_dir
+        self.known_hashes = known_hashes or {}
+        self.hashes = {}
+        self.written = 0
+        self.skipped = 0
+        self.removed = 0
+
+    def _existing_hash(self, rel_path, file_path, size):
+        try:
+            existing_size = os.path.getsize(file_path)
+        except OSError:
+            return None
+        if existing_size != size:
+            return None
+        known = self.known_hashes.get(rel_path)
+        if known:
+            return known
+        digest = hashlib.sha1()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def write(self, rel_path, content):
+        """
+        Menulis content (str atau bytes) ke rel_path. Mengembalikan True jika file ditulis,
+        False jika isinya sama dengan yang sudah ada.
+        """
+        data = content if isinstance(content, bytes) else content.encode('utf-8')
+        digest = content_hash(data)
+        file_path = os.path.join(self.output_dir, rel_path)
+        self.hashes[rel_path] = digest
+        if self._existing_hash(rel_path, file_path, len(data)) == digest:
+            self.skipped += 1
+            return False
+
+        tmp_path = self._temp_file(file_path)
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            self._replace(tmp_path, file_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.written += 1
+        return True
+
+    def open(self, rel_path):
+        """
+        Membuka rel_path untuk ditulis secara streaming (lihat StreamedOutput), untuk file besar
+        yang tidak perlu disusun utuh di memori dulu.
+        """
+        return StreamedOutput(self, rel_path)
+
+    def _temp_file(self, file_path):
+        directory = os.path.dirname(file_path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(file_path) + '.', suffix='.tmp')
+        os.close(fd)
+        return tmp_path
+
+    def _replace(self, tmp_path, file_path):
+        os.chmod(tmp_path, 0o666 & ~_UMASK)
+        os.replace(tmp_path, file_path)
+
+    def remove(self, rel_paths):
+        """
+        Menghapus file output yang sudah tidak dihasilkan lagi (postingan/label yang dihapus),
+        beserta folder yang menjadi kosong karenanya.
+        """
+        output_root = os.path.abspath(self.output_dir)
+        for rel_path in rel_paths:
+            file_path = os.path.join(output_root, rel_path)
+            if not os.path.isfile(file_path):
+                continue
+            os.remove(file_path)
+            self.removed += 1
+            directory = os.path.dirname(file_path)
+            while directory != output_root and directory.startswith(output_root + os.sep):
+                try:
+                    os.rmdir(directory)
+                except OSError:
+                    break
+                directory = os.path.dirname(directory)
+
+    def summary(self):
+        return f"{self.written} ditulis, {self.skipped} tidak berubah, {self.removed} dihapus"
+
+
+class StreamedOutput:
+    """
+    File output yang ditulis sedikit demi sedikit ke file sementara sambil menghitung hash-nya.
+    Saat ditutup, file sementara menggantikan file lama hanya jika isinya berbeda; jika sama,
+    file sementara dibuang. Dipakai sebagai context manager: jika terjadi error, file lama tidak disentuh.
+    """
+
+    def __init__(self, writer, rel_path):
+        self.writer = writer
+        self.rel_path = rel_path
+        self.file_path = os.path.join(writer.output_dir, rel_path)
+        self.tmp_path = writer._temp_file(self.file_path)
+        self.size = 0
+        self.written = False
+        self._file = open(self.tmp_path, 'wb')
+        self._hash = hashlib.sha1()
+
+    def write(self, data):
+        self._file.write(data)
+        self._hash.update(data)
+        self.size += len(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        """Menyelesaikan file. Mengembalikan True jika file ditulis, False jika isinya tidak berubah."""
+        if self._file.closed:
+            return self.written
+        self._file.close()
+        digest = self._hash.hexdigest()
+        self.writer.hashes[self.rel_path] = digest
+        if self.writer._existing_hash(self.rel_path, self.file_path, self.size) == digest:
+            os.remove(self.tmp_path)
+            self.writer.skipped += 1
+            return False
+        self.writer._replace(self.tmp_path, self.file_path)
+        self.writer.written += 1
+        self.written = True
+        return True
+
+    def abort(self):
+        if not self._file.closed:
+            self._file.close()
+            os.remove(self.tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
@@ -0,0 +1,171 @@
+# post_store.py
+# Penyimpanan lokal (SQLite) untuk snapshot postingan Blogger + sinkronisasi delta.
+import os
+import json
+import sqlite3
+from utils import parse_timestamp
+from blogger_client import BloggerAPIError
+
+
+class PostStore:
+    """
+    Snapshot postingan Blogger terakhir di file SQLite.
+    Setiap baris menyimpan JSON mentah postingan apa adanya seperti dikembalikan API.
+    """
+
+    def __init__(self, path, readonly=False):
+        self.path = path
+        if readonly:
+            # Dipakai worker render: hanya membaca isi postingan, tanpa menyentuh skema
+            self.conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS posts ("
+            " id TEXT PRIMARY KEY,"
+            " published TEXT,"
+            " updated TEXT,"
+            " data TEXT NOT NULL)"
+        )
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        # Isi postingan yang sudah dioptimalkan (lihat process_post_html), supaya build streaming
+        # tidak perlu menyimpannya di memori sampai halamannya dirender
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS bodies ("
+            " id TEXT PRIMARY KEY,"
+            " content_hash TEXT NOT NULL,"
+            " html TEXT NOT NULL)"
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+
+    def get_meta(self, key, default=None):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key, value):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def upsert_posts(self, posts):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO posts (id, published, updated, data) VALUES (?, ?, ?, ?)",
+            [(p['id'], p.get('published'), p.get('updated'),
+              json.dumps(p, ensure_ascii=False, separators=(',', ':'))) for p in posts]
+        )
+
+    def ids(self):
+        return {row[0] for row in self.conn.execute("SELECT id FROM posts")}
+
+    def delete_posts(self, post_ids):
+        self.conn.executemany("DELETE FROM posts WHERE id = ?", [(post_id,) for post_id in post_ids])
+        self.conn.executemany("DELETE FROM bodies WHERE id = ?", [(post_id,) for post_id in post_ids])
+
+    def commit(self):
+        self.conn.commit()
+
+    def rollback(self):
+        self.conn.rollback()
+
+    def iter_posts(self):
+        """
+        Semua postingan tersimpan satu per satu, tanpa memuat seluruh store ke memori sekaligus.
+        Diurutkan menurut id supaya postingan dengan 'published' yang sama selalu muncul dalam urutan
+        yang sama (sort berikutnya stabil), berapa kali pun store ditulis ulang.
+        """
+        for (data,) in self.conn.execute("SELECT data FROM posts ORDER BY id"):
+            yield json.loads(data)
+
+    def get_content(self, post_id):
+        """HTML mentah ('content') satu postingan, atau None jika tidak ada."""
+        row = self.conn.execute("SELECT json_extract(data, '$.content') FROM posts WHERE id = ?", (post_id,)).fetchone()
+        return row[0] if row else None
+
+    def put_body(self, post_id, content_hash, html):
+        self.conn.execute("INSERT OR REPLACE INTO bodies (id, content_hash, html) VALUES (?, ?, ?)",
+                          (post_id, content_hash, html))
+
+    def get_body(self, post_id, content_hash):
+        """Isi postingan yang sudah dioptimalkan, atau None jika belum ada untuk hash konten ini."""
+        row = self.conn.execute("SELECT html FROM bodies WHERE id = ? AND content_hash = ?",
+                                (post_id, content_hash)).fetchone()
+        return row[0] if row else None
+
+
+def sync_blogger_posts(store, client, blog_id, max_results=500, sync_deletions=True):
+    """
+    Menyinkronkan store lokal dengan Blogger.
+
+    Build pertama mengambil semua postingan beserta isinya. Build berikutnya hanya mengambil
+    postingan yang 'updated'-nya lebih baru dari sinkronisasi terakhir (orderBy=updated, terbaru dulu,
+    berhenti begitu menemukan postingan lama). Penghapusan dideteksi dengan daftar id saja
+    (tanpa isi postingan), lalu postingan yang sudah tidak ada di Blogger dihapus dari store.
+    Setiap halaman langsung disimpan ke store selagi halaman berikutnya diunduh (lihat BloggerClient.iter_pages).
+
+    Args:
+        store (PostStore): Store lokal.
+        client (BloggerClient): Klien Blogger API.
+        blog_id (str): ID blog.
+
+    Returns:
+        bool: True jika sinkronisasi lengkap, False jika ada request yang gagal
+              (store tetap berisi snapshot terakhir yang valid).
+    """
+    last_updated = store.get_meta('last_updated')
+    changed_count = 0
+    newest = last_updated
+
+    try:
+        if last_updated is None:
+            print("Post store kosong, mengambil semua postingan...")
+            pages = client.iter_pages(blog_id, max_results=max_results)
+        else:
+            print(f"Mengambil postingan yang diperbarui sejak {last_updated}...")
+            # Tanpa prefetch: biasanya sudah berhenti di halaman pertama
+            pages = client.iter_pages(blog_id, prefetch=False, max_results=max_results, order_by='updated')
+        last_updated_dt = parse_timestamp(last_updated) if last_updated else None
+        for posts_data in pages:
+            changed = []
+            done = False
+            for post_item in posts_data.get('items', []):
+                # Postingan dengan timestamp sama diambil ulang, supaya yang diperbarui
+                # di detik yang sama dengan sinkronisasi terakhir tidak terlewat.
+                if last_updated_dt and parse_timestamp(post_item['updated']) < last_updated_dt:
+                    done = True
+                    break
+                changed.append(post_item)
+                if post_item.get('updated') and (newest is None or parse_timestamp(post_item['updated']) > parse_timestamp(newest)):
+                    newest = post_item['updated']
+            store.upsert_posts(changed)
+            changed_count += len(changed)
+            if done:
+                pages.close()
+                break
+    except BloggerAPIError as e:
+        # Halaman yang sudah diterima dibatalkan: hasil yang terpotong bukan snapshot yang valid
+        print(e)
+        store.rollback()
+        return False
+
+    deleted = set()
+    if sync_deletions and last_updated is not None:
+        try:
+            remote_ids = {item['id'] for item in client.iter_posts(blog_id, max_results=max_results, fetch_bodies=False,
+                                                                  fields='nextPageToken,items(id)')}
+        except BloggerAPIError as e:
+            print(e)
+            store.commit()
+            return False
+        deleted = store.ids() - remote_ids
+        store.delete_posts(deleted)
+
+    if newest:
+        store.set_meta('last_updated', newest)
+    store.commit()
+    print(f"Sinkronisasi selesai: {changed_count} postingan baru/diperbarui, {len(deleted)} dihapus, {len(store)} tersimpan.")
+    return True
@@ -0,0 +1,22 @@
+// Widget "Artikel Terbaru" untuk paginasi stabil (PAGINATION_MODE=stable/month).
+// Daftarnya tidak ditulis di setiap halaman HTML, tapi dimuat dari recent-posts.json
+// (dibuat oleh main.py), supaya postingan baru tidak mengubah seluruh halaman situs.
+!function () {
+    var placeholder = document.querySelector("[data-recent-posts]");
+    if (!placeholder || !window.fetch) return;
+    var list = placeholder.parentNode;
+    fetch(placeholder.getAttribute("data-recent-posts")).then(function (r) {
+        if (!r.ok) throw new Error(r.status);
+        return r.json();
+    }).then(function (posts) {
+        if (!posts.length) return;
+        list.innerHTML = "";
+        posts.forEach(function (post) {
+            var li = document.createElement("li"), a = document.createElement("a");
+            a.href = post.url;
+            a.textContent = post.title;
+            li.appendChild(a);
+            list.appendChild(li);
+        });
+    }).catch(function () {});
+}();
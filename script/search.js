@@ -0,0 +1,140 @@
+// Pencarian statis untuk overlay #searchfs.
+// Index dibuat oleh main.py (search_index.py) di folder /search/:
+//   index.json  -> daftar shard term (per prefix) dan blok dokumen
+//   t-*.json.gz -> term -> nomor dokumen (delta encoded)
+//   d-*.json.gz -> nomor dokumen -> [judul, url, tanggal]
+// Hanya shard yang prefix-nya cocok dengan kata yang diketik yang diunduh.
+!function () {
+    var overlay = document.querySelector("#searchfs");
+    if (!overlay || !window.fetch) return;
+    var form = overlay.querySelector("form"),
+        input = overlay.querySelector('input[type="search"]'),
+        maxInput = overlay.querySelector('input[name="max-results"]'),
+        maxResults = maxInput ? parseInt(maxInput.value, 10) || 8 : 8,
+        results = document.createElement("ul"),
+        base = "/search/",
+        cache = {},
+        manifest = null,
+        timer = null,
+        lastQuery = "";
+
+    results.className = "search-results";
+    overlay.appendChild(results);
+    // Klik di hasil pencarian tidak boleh menutup overlay
+    results.addEventListener("click", function (e) { e.stopPropagation(); });
+
+    function load(file, gzipped) {
+        if (!cache[file]) {
+            cache[file] = fetch(base + encodeURIComponent(file)).then(function (r) {
+                if (!r.ok) throw new Error(r.status);
+                if (!gzipped) return r.json();
+                return new Response(r.body.pipeThrough(new DecompressionStream("gzip"))).json();
+            });
+        }
+        return cache[file];
+    }
+
+    function getManifest() {
+        if (!manifest) manifest = load("index.json", false);
+        return manifest;
+    }
+
+    function tokenize(text) {
+        return (text.toLowerCase().match(/[\p{L}\p{N}_]+/gu) || []);
+    }
+
+    // Shard yang mungkin berisi term berawalan `token`: shard dengan prefix terpanjang yang
+    // merupakan awalan token, ditambah semua shard yang prefix-nya diawali token.
+    function shardsFor(index, token) {
+        var best = null, keys = [];
+        Object.keys(index.shards).forEach(function (key) {
+            if (token.indexOf(key) === 0) {
+                if (!best || key.length > best.length) best = key;
+            } else if (key.indexOf(token) === 0) {
+                keys.push(key);
+            }
+        });
+        if (best) keys.push(best);
+        return keys.map(function (key) { return index.shards[key]; });
+    }
+
+    // Set nomor dokumen yang memuat kata berawalan `token`
+    function docsFor(index, token) {
+        return Promise.all(shardsFor(index, token).map(function (file) { return load(file, true); }))
+            .then(function (shards) {
+                var docs = {};
+                shards.forEach(function (terms) {
+                    Object.keys(terms).forEach(function (term) {
+                        if (term.indexOf(token) !== 0) return;
+                        var n = 0;
+                        terms[term].forEach(function (delta) { n += delta; docs[n] = true; });
+                    });
+                });
+                return docs;
+            });
+    }
+
+    function search(query) {
+        return getManifest().then(function (index) {
+            var tokens = tokenize(query).filter(function (t) { return t.length >= index.min_token_length; });
+            if (!tokens.length) return [];
+            return Promise.all(tokens.map(function (t) { return docsFor(index, t); })).then(function (sets) {
+                // Semua kata harus cocok; nomor dokumen lebih besar = postingan lebih baru
+                var matches = Object.keys(sets[0]).filter(function (n) {
+                    return sets.every(function (set) { return set[n]; });
+                }).map(Number).sort(function (a, b) { return b - a; }).slice(0, maxResults);
+                var blocks = {};
+                matches.forEach(function (n) { blocks[Math.floor(n / index.docs_per_block)] = true; });
+                return Promise.all(Object.keys(blocks).map(function (b) {
+                    return load(index.blocks[b], true);
+                })).then(function (loaded) {
+                    var docs = {};
+                    loaded.forEach(function (block) {
+                        Object.keys(block).forEach(function (n) { docs[n] = block[n]; });
+                    });
+                    return matches.map(function (n) { return docs[n]; }).filter(Boolean);
+                });
+            });
+        });
+    }
+
+    function show(docs, query) {
+        results.innerHTML = "";
+        if (!docs.length) {
+            var empty = document.createElement("li");
+            empty.textContent = query ? "Tidak ada hasil untuk “" + query + "”" : "";
+            if (query) results.appendChild(empty);
+            return;
+        }
+        docs.forEach(function (doc) {
+            var li = document.createElement("li"), a = document.createElement("a");
+            a.href = doc[1];
+            a.textContent = doc[0];
+            li.appendChild(a);
+            li.appendChild(document.createTextNode(doc[2]));
+            results.appendChild(li);
+        });
+    }
+
+    function run() {
+        var query = input.value.trim();
+        if (query === lastQuery) return;
+        lastQuery = query;
+        if (!query) return show([], "");
+        search(query).then(function (docs) {
+            if (query === lastQuery) show(docs, query);
+        }).catch(function () {
+            if (query === lastQuery) show([], query);
+        });
+    }
+
+    input.addEventListener("input", function () {
+        clearTimeout(timer);
+        timer = setTimeout(run, 150);
+    });
+    input.addEventListener("focus", getManifest);
+    form.addEventListener("submit", function (e) {
+        e.preventDefault();
+        run();
+    });
+}();
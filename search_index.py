@@ -0,0 +1,128 @@
+# search_index.py
+# Index pencarian statis untuk overlay #searchfs (lihat script/search.js).
+#
+# Struktur output di folder search/:
+#   index.json                  -> daftar shard term dan blok dokumen (nama file berisi hash konten)
+#   t-<prefix>-<hash>.json.gz   -> shard inverted index: term -> daftar nomor dokumen (delta encoded)
+#   d-<blok>-<hash>.json.gz     -> blok dokumen: nomor dokumen -> [judul, url, tanggal]
+#
+# Browser hanya mengunduh index.json, shard yang prefix-nya cocok dengan kata yang diketik,
+# dan blok dokumen untuk hasil yang ditampilkan.
+import re
+import gzip
+import json
+import hashlib
+
+SEARCH_DIR = 'search'
+MIN_TOKEN_LENGTH = 2
+# Prefix awal shard; shard yang melebihi budget dipecah lagi per karakter sampai panjang maksimal
+SHARD_PREFIX_LENGTH = 2
+MAX_SHARD_PREFIX_LENGTH = 6
+DOCS_PER_BLOCK = 256
+
+_TOKEN_RE = re.compile(r'\w+')
+
+
+def tokenize(text):
+    return [token for token in _TOKEN_RE.findall(text.lower()) if len(token) >= MIN_TOKEN_LENGTH]
+
+
+def assign_doc_numbers(posts, previous_numbers):
+    """
+    Nomor dokumen yang stabil antar build: postingan lama mempertahankan nomornya dan postingan baru
+    mendapat nomor berikutnya (urut dari yang terlama). Dengan begitu satu postingan baru hanya
+    mengubah shard yang memuat kata-katanya dan blok dokumen terakhir, bukan seluruh index.
+    Nomor postingan yang dihapus tidak dipakai ulang.
+    """
+    current_ids = {post.id for post in posts}
+    numbers = {post_id: number for post_id, number in previous_numbers.items() if post_id in current_ids}
+    next_number = max(previous_numbers.values(), default=-1) + 1
+    for post in sorted(posts, key=lambda p: p.published):
+        if post.id not in numbers:
+            numbers[post.id] = next_number
+            next_number += 1
+    return numbers
+
+
+def _compact_json(data):
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+
+
+def _hashed_file(prefix, data):
+    """Mengompres data (gzip deterministik) dan memberi nama file berdasarkan hash isinya."""
+    payload = gzip.compress(_compact_json(data).encode('utf-8'), mtime=0)
+    digest = hashlib.sha1(payload).hexdigest()[:12]
+    return f"{prefix}-{digest}.json.gz", payload
+
+
+def _split_shards(key, terms, shard_budget):
+    """
+    Memecah shard yang terlalu besar berdasarkan karakter berikutnya dari term.
+    Term yang panjangnya sama dengan prefix tetap berada di shard induk.
+    """
+    size = len(_compact_json(terms))
+    if size <= shard_budget or len(key) >= MAX_SHARD_PREFIX_LENGTH:
+        return {key: terms}
+    shards = {}
+    children = {}
+    for term, postings in terms.items():
+        if len(term) == len(key):
+            shards.setdefault(key, {})[term] = postings
+        else:
+            children.setdefault(term[:len(key) + 1], {})[term] = postings
+    for child_key, child_terms in children.items():
+        shards.update(_split_shards(child_key, child_terms, shard_budget))
+    return shards
+
+
+def build_search_index(posts, doc_numbers, shard_budget=16384):
+    """
+    Membangun index pencarian dari judul, label dan teks preview postingan.
+
+    Args:
+        posts (list): Daftar Post.
+        doc_numbers (dict): id postingan -> nomor dokumen (lihat assign_doc_numbers).
+        shard_budget (int): Ukuran maksimal (byte JSON sebelum kompresi) per shard term.
+
+    Returns:
+        dict: rel_path -> isi file (bytes untuk shard/blok, str untuk index.json).
+    """
+    postings_by_term = {}
+    docs_by_block = {}
+    for post in posts:
+        number = doc_numbers[post.id]
+        text = " ".join((post.title, " ".join(post.labels), post.parsed_content))
+        for token in set(tokenize(text)):
+            postings_by_term.setdefault(token, []).append(number)
+        docs_by_block.setdefault(number // DOCS_PER_BLOCK, {})[str(number)] = [
+            post.title, post.detail_url, post.published.strftime('%Y-%m-%d')]
+
+    # Posting list diurutkan lalu di-delta encode supaya angkanya kecil dan mudah dikompres
+    terms_by_prefix = {}
+    for term, numbers in postings_by_term.items():
+        numbers.sort()
+        deltas = [numbers[0]] + [b - a for a, b in zip(numbers, numbers[1:])]
+        terms_by_prefix.setdefault(term[:SHARD_PREFIX_LENGTH], {})[term] = deltas
+
+    files = {}
+    shard_files = {}
+    for prefix in sorted(terms_by_prefix):
+        for key, terms in _split_shards(prefix, terms_by_prefix[prefix], shard_budget).items():
+            filename, payload = _hashed_file(f"t-{key}", terms)
+            shard_files[key] = filename
+            files[f"{SEARCH_DIR}/{filename}"] = payload
+
+    block_files = {}
+    for block in sorted(docs_by_block):
+        filename, payload = _hashed_file(f"d-{block}", docs_by_block[block])
+        block_files[str(block)] = filename
+        files[f"{SEARCH_DIR}/{filename}"] = payload
+
+    files[f"{SEARCH_DIR}/index.json"] = _compact_json({
+        'version': 1,
+        'min_token_length': MIN_TOKEN_LENGTH,
+        'docs_per_block': DOCS_PER_BLOCK,
+        'shards': shard_files,
+        'blocks': block_files,
+    })
+    return files
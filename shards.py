@@ -0,0 +1,152 @@
+# shards.py
+# Build terpartisi: build dibagi ke beberapa shard yang bisa berjalan di mesin berbeda (misalnya matrix job CI),
+# lalu digabung secara deterministik. Hasil gabungannya identik byte demi byte dengan build satu proses.
+#
+# Fase (BUILD_PHASE), dijalankan berurutan dengan output dan .build_cache build sebelumnya yang sama:
+#   fetch   - sinkronisasi post store dari API Blogger saja (sekali, sebelum shard berjalan)
+#   process - shard BUILD_SHARD dari BUILD_SHARDS mengolah HTML postingan miliknya (partisi hash id postingan)
+#             dan menulis partial process-<k>-of-<n>.json
+#   render  - setiap shard menggabungkan semua partial process (jadi tahu related posts, label, artikel terbaru
+#             dan paginasi global), lalu hanya merender halaman miliknya: halaman postingan menurut hash id
+#             postingan, halaman kategori menurut hash slug label. Partial render-<k>-of-<n>.json berisi
+#             fingerprint dan hash halaman tersebut; render-<k>-of-<n>.txt daftar file-nya.
+#   merge   - menggabungkan semua partial, merender bagian global (paginasi index, recent-posts.json, sitemap,
+#             index pencarian, aset) dan menyimpan manifest lengkap. File halaman dari shard harus sudah
+#             disalin ke output sebelum fase ini.
+# Fase process/render/merge selalu membangun dari post store lokal (tanpa API).
+#
+# Isi postingan yang sudah dioptimalkan (tabel bodies di post store) disimpan permanen oleh fase merge dari
+# partial fase process; post store merge itulah yang masuk cache build berikutnya. Fase process tidak menulis
+# isi ke post store-nya sendiri (salinan per job yang dibuang), fase render hanya menulis isi postingan
+# miliknya ke salinannya untuk dibaca worker render.
+import os
+import json
+import hashlib
+
+SHARD_PARTIAL_VERSION = 1
+BUILD_PHASES = ('fetch', 'process', 'render', 'merge')
+
+
+def shard_settings(phase, shard, count):
+    """
+    Memeriksa pengaturan build terpartisi.
+
+    Args:
+        phase (str): BUILD_PHASE ('' = build biasa satu proses).
+        shard (int): BUILD_SHARD, nomor shard (1..count) untuk fase process dan render.
+        count (int): BUILD_SHARDS, jumlah shard.
+
+    Returns:
+        tuple: (phase, shard, count); shard None untuk fase yang tidak per shard.
+    """
+    if not phase:
+        return None, None, None
+    if phase not in BUILD_PHASES:
+        raise ValueError(f"BUILD_PHASE harus salah satu dari {', '.join(BUILD_PHASES)}, bukan '{phase}'.")
+    if phase == 'fetch':
+        return phase, None, None
+    if count < 1:
+        raise ValueError(f"BUILD_SHARDS harus diisi (minimal 1) untuk fase {phase}.")
+    if phase == 'merge':
+        return phase, None, count
+    if not 1 <= shard <= count:
+        raise ValueError(f"BUILD_SHARD harus antara 1 dan {count} untuk fase {phase}, bukan {shard}.")
+    return phase, shard, count
+
+
+def shard_of(key, count):
+    """Shard (1..count) untuk sebuah kunci (id postingan atau slug label). Stabil antar proses dan mesin."""
+    digest = hashlib.sha1(str(key).encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') % count + 1
+
+
+def partial_path(shard_dir, phase, shard, count):
+    return os.path.join(shard_dir, f"{phase}-{shard}-of-{count}.json")
+
+
+def write_partial(shard_dir, phase, shard, count, data, files=None):
+    """
+    Menulis partial satu shard. Jika files diisi, daftar file output shard ini (path relatif, satu per baris)
+    ikut ditulis di sebelahnya dengan akhiran .txt, misalnya untuk `tar -T` di CI.
+
+    Returns:
+        str: Path partial.
+    """
+    os.makedirs(shard_dir, exist_ok=True)
+    path = partial_path(shard_dir, phase, shard, count)
+    payload = dict(data, version=SHARD_PARTIAL_VERSION, phase=phase, shard=shard, count=count)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    if files is not None:
+        with open(path[:-len('.json')] + '.txt', 'w', encoding='utf-8') as f:
+            f.writelines(f"{rel_path}\n" for rel_path in files)
+    return path
+
+
+def iter_partials(shard_dir, phase, count):
+    """
+    Membaca partial shard 1..count satu per satu (urutan shard tetap, supaya penggabungan deterministik).
+    Semua shard harus ada dan berasal dari jumlah shard yang sama.
+    """
+    for shard in range(1, count + 1):
+        path = partial_path(shard_dir, phase, shard, count)
+        if not os.path.exists(path):
+            raise ValueError(f"Partial fase {phase} shard {shard}/{count} tidak ditemukan: {path}")
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != SHARD_PARTIAL_VERSION or data.get('count') != count:
+            raise ValueError(f"Partial {path} berasal dari versi atau jumlah shard yang berbeda.")
+        yield data
+
+
+def load_processed_posts(shard_dir, count, keep_body=None, store_body=None):
+    """
+    Menggabungkan partial fase process menjadi {id_postingan: entri}. Entri berformat sama dengan entri
+    postingan di manifest build (updated, hash, thumbnail_url, parsed_content), ditambah 'body' (isi yang sudah
+    dioptimalkan) untuk postingan yang baru diolah dan keep_body(id) bernilai True.
+
+    Args:
+        store_body (callable): Jika diisi, dipanggil store_body(id, hash_konten, isi) untuk setiap isi di partial
+                               (misalnya PostStore.put_body), supaya isinya tidak perlu ditahan di memori.
+    """
+    processed = {}
+    for data in iter_partials(shard_dir, 'process', count):
+        for post_id, entry in data['posts'].items():
+            if post_id in processed:
+                raise ValueError(f"Postingan {post_id} ada di lebih dari satu partial shard.")
+            if store_body is not None and entry.get('body') is not None:
+                store_body(post_id, entry['hash'], entry['body'])
+            if keep_body is None or not keep_body(post_id):
+                entry.pop('body', None)
+            processed[post_id] = entry
+    return processed
+
+
+def load_rendered_pages(shard_dir, count):
+    """
+    Menggabungkan partial fase render.
+
+    Returns:
+        tuple: ({rel_path: (fingerprint, hash_isi)}, {nama_template: css_kritis}). CSS kritis diambil dari shard
+               dengan nomor terkecil yang memilikinya (semua shard menghitungnya dari halaman contoh yang sama).
+    """
+    pages = {}
+    critical_css = {}
+    for data in iter_partials(shard_dir, 'render', count):
+        for rel_path, (page_fingerprint, output_hash) in data['pages'].items():
+            pages[rel_path] = (page_fingerprint, output_hash)
+        for template_name, css in data.get('critical_css', {}).items():
+            critical_css.setdefault(template_name, css)
+    return pages, critical_css
+
+
+def remove_partials(shard_dir, count):
+    """Menghapus partial setelah merge berhasil, supaya tidak ikut tersimpan di cache build berikutnya."""
+    for phase in ('process', 'render'):
+        for shard in range(1, count + 1):
+            path = partial_path(shard_dir, phase, shard, count)
+            for file_path in (path, path[:-len('.json')] + '.txt'):
+                if os.path.exists(file_path):
+                    os.remove(file_path)
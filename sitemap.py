@@ -0,0 +1,168 @@
+# sitemap.py
+# Penulisan sitemap secara streaming: setiap URL langsung ditulis ke file, tanpa menyusun
+# seluruh sitemap di memori. URL dipecah per jenis (postingan, halaman, kategori) dan per batas
+# protokol sitemap (50.000 URL atau 50 MB per file), lalu dirangkum di sitemap_index.xml.
+import gzip
+from html import escape as _html_escape
+
+# Batas protokol sitemap (https://www.sitemaps.org/protocol.html)
+SITEMAP_MAX_URLS = 50000
+SITEMAP_MAX_BYTES = 50 * 1024 * 1024
+
+# Index ditulis dengan dua nama: sitemap_index.xml, dan sitemap.xml supaya URL sitemap
+# yang sudah didaftarkan di Google Search Console tetap berlaku.
+SITEMAP_INDEX_FILES = ('sitemap_index.xml', 'sitemap.xml')
+
+_URLSET_HEADER = b'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+_URLSET_FOOTER = b'</urlset>'
+
+_URL_ENTRY_TEMPLATE = """    <url>
+        <loc>{loc}</loc>
+        {lastmod_tag}
+        <changefreq>{changefreq}</changefreq>
+        <priority>{priority}</priority>
+    </url>
+"""
+
+_SITEMAP_INDEX_HEADER = b'<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+_SITEMAP_INDEX_FOOTER = b'</sitemapindex>'
+
+_SITEMAP_ENTRY_TEMPLATE = """    <sitemap>
+        <loc>{loc}</loc>
+        {lastmod_tag}
+    </sitemap>
+"""
+
+
+def escape(text):
+    # Sama dengan xml.sax.saxutils.escape (&, < dan >), tanpa ikut meng-import urllib/http/ssl
+    return _html_escape(text, quote=False)
+
+
+def _lastmod_tag(lastmod):
+    return f"<lastmod>{lastmod}</lastmod>" if lastmod else ""
+
+
+class _SitemapFile:
+    """Satu file sitemap yang sedang ditulis (plus salinan .gz-nya jika diminta)."""
+
+    def __init__(self, writer, rel_path, compress):
+        self.rel_path = rel_path
+        self.url_count = 0
+        self.size = 0
+        self.lastmod = None
+        self._outputs = [writer.open(rel_path)]
+        self._gzip = None
+        if compress:
+            gz_output = writer.open(rel_path + '.gz')
+            self._outputs.append(gz_output)
+            # mtime=0 dan tanpa nama file: hasil kompresi deterministik, jadi file .gz yang
+            # isinya tidak berubah juga tidak ditulis ulang.
+            self._gzip = gzip.GzipFile(filename='', mode='wb', fileobj=gz_output, mtime=0)
+        self.write(_URLSET_HEADER)
+
+    def write(self, data):
+        self._outputs[0].write(data)
+        if self._gzip is not None:
+            self._gzip.write(data)
+        self.size += len(data)
+
+    def close(self):
+        self.write(_URLSET_FOOTER)
+        if self._gzip is not None:
+            self._gzip.close()
+        for output in self._outputs:
+            output.close()
+
+    def abort(self):
+        for output in self._outputs:
+            output.abort()
+
+
+class SitemapWriter:
+    """
+    Menulis entri sitemap secara streaming ke file sitemap-<jenis>-<n>.xml.
+    File baru dimulai begitu batas jumlah URL atau ukuran file tercapai.
+
+    Args:
+        writer (OutputWriter): Penulis output (file yang isinya tidak berubah tidak ditulis ulang).
+        base_url (str): URL dasar situs, untuk URL absolut di sitemap index.
+        max_urls (int): Jumlah URL maksimal per file sitemap.
+        max_bytes (int): Ukuran maksimal (byte, sebelum kompresi) per file sitemap.
+        compress (bool): Juga menulis salinan .xml.gz dari setiap sitemap; sitemap index
+                         lalu menunjuk ke file .gz.
+    """
+
+    def __init__(self, writer, base_url, max_urls=SITEMAP_MAX_URLS, max_bytes=SITEMAP_MAX_BYTES, compress=False):
+        self.writer = writer
+        self.base_url = base_url
+        self.max_urls = max_urls
+        self.max_bytes = max_bytes
+        self.compress = compress
+        # (rel_path, lastmod) setiap sitemap yang sudah selesai, untuk sitemap index
+        self.sitemaps = []
+        # Jumlah URL per jenis sitemap
+        self.url_counts = {}
+
+    def write_urls(self, sitemap_type, entries):
+        """
+        Menulis entries (iterable dict dengan loc, lastmod, changefreq, priority) ke sitemap
+        berjenis sitemap_type. entries boleh berupa generator; hanya satu entri yang dipegang di memori.
+        """
+        current = None
+        file_number = 0
+        try:
+            for entry in entries:
+                data = _URL_ENTRY_TEMPLATE.format(
+                    loc=escape(entry['loc']),
+                    lastmod_tag=_lastmod_tag(entry['lastmod']),
+                    changefreq=entry['changefreq'],
+                    priority=entry['priority'],
+                ).encode('utf-8')
+                if current is not None and (current.url_count >= self.max_urls or
+                                            current.size + len(data) + len(_URLSET_FOOTER) > self.max_bytes):
+                    self._finish(current)
+                    current = None
+                if current is None:
+                    file_number += 1
+                    current = _SitemapFile(self.writer, f"sitemap-{sitemap_type}-{file_number}.xml", self.compress)
+                current.write(data)
+                current.url_count += 1
+                self.url_counts[sitemap_type] = self.url_counts.get(sitemap_type, 0) + 1
+                if entry['lastmod'] and (current.lastmod is None or entry['lastmod'] > current.lastmod):
+                    current.lastmod = entry['lastmod']
+        except BaseException:
+            if current is not None:
+                current.abort()
+            raise
+        if current is not None:
+            self._finish(current)
+
+    def _finish(self, sitemap_file):
+        sitemap_file.close()
+        self.sitemaps.append((sitemap_file.rel_path, sitemap_file.lastmod))
+
+    def write_index(self):
+        """Menulis sitemap index yang menunjuk ke semua sitemap yang sudah ditulis."""
+        parts = [_SITEMAP_INDEX_HEADER]
+        for rel_path, lastmod in self.sitemaps:
+            if self.compress:
+                rel_path += '.gz'
+            parts.append(_SITEMAP_ENTRY_TEMPLATE.format(
+                loc=escape(f"{self.base_url}/{rel_path}"),
+                lastmod_tag=_lastmod_tag(lastmod),
+            ).encode('utf-8'))
+        parts.append(_SITEMAP_INDEX_FOOTER)
+        index_xml = b"".join(parts)
+        for rel_path in SITEMAP_INDEX_FILES:
+            self.writer.write(rel_path, index_xml)
+
+    def output_files(self):
+        """Semua file yang dihasilkan (sitemap, salinan .gz dan sitemap index)."""
+        files = []
+        for rel_path, _ in self.sitemaps:
+            files.append(rel_path)
+            if self.compress:
+                files.append(rel_path + '.gz')
+        files.extend(SITEMAP_INDEX_FILES)
+        return files
@@ -1,6 +1,8 @@
 # utils.py (Revisi untuk mendukung page_token)
 import os
-import requests
+import re
+from datetime import datetime
+from functools import lru_cache
 
 def get_secret(key):
     """
@@ -11,29 +13,53 @@ def get_secret(key):
         raise ValueError(f"Environment variable '{key}' not set.")
     return value
 
-# --- FUNGSI get_blogger_posts YANG DIPERBARUI ---
-def get_blogger_posts(blog_id, api_key, max_results=10, page_token=None): # <-- Tambahkan page_token=None di sini
-    """
-    Fetches a list of posts from a specified Blogger blog.
-    """
-    base_url = f"https://www.googleapis.com/blogger/v3/blogs/{blog_id}/posts"
-    
-    # Siapkan parameter untuk request
-    params = {
-        'key': api_key,
-        'fetchBodies': True, # Pastikan konten postingan juga diambil
-        'maxResults': max_results
-    }
-    
-    # Jika ada page_token, tambahkan ke parameter
-    if page_token:
-        params['pageToken'] = page_token
+@lru_cache(maxsize=65536)
+def slugify(text):
+    # Di-cache: label yang sama di-slugify ribuan kali (halaman, template, sitemap)
+    text = str(text).lower()
+    text = re.sub(r'[^a-z0-9\s-]', '', text)
+    text = re.sub(r'[\s_-]+', '-', text)
+    text = re.sub(r'^-+', '', text)
+    text = re.sub(r'-+$', '', text)
+    return text
 
+def parse_timestamp(value):
+    """
+    Parses an ISO 8601 timestamp from the Blogger API (e.g. "2023-10-27T10:00:00Z").
+    """
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+def get_setting(key, default=None):
+    """
+    Retrieves an optional build setting from the environment.
+    The value is converted to the type of `default` (bool or int) when possible.
+    """
+    value = os.getenv(key)
+    if value is None or value.strip() == '':
+        return default
+    if isinstance(default, bool):
+        return value.strip().lower() in ('1', 'true', 'yes', 'on')
+    if isinstance(default, int):
+        return int(value)
+    return value
+
+# --- FUNGSI get_blogger_posts ---
+def get_blogger_posts(blog_id, api_key, max_results=10, page_token=None, order_by=None, fetch_bodies=True, fields=None):
+    """
+    Fetches a single page of posts from a specified Blogger blog.
+    Kept for compatibility; the build itself uses BloggerClient (blogger_client.py), which adds
+    a keep-alive session, timeouts, retries and page prefetching.
+    Returns None if the request fails after all retries.
+    """
+    from blogger_client import BloggerClient, BloggerAPIError, BLOGGER_API_BASE
+
+    client = BloggerClient(api_key, base_url=get_setting('BLOGGER_API_BASE', BLOGGER_API_BASE))
     try:
-        response = requests.get(base_url, params=params) # Gunakan params dictionary
-        response.raise_for_status()  # Raise an exception for HTTP errors
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching Blogger posts: {e}")
+        return client.list_posts(blog_id, max_results=max_results, page_token=page_token,
+                                 order_by=order_by, fetch_bodies=fetch_bodies, fields=fields)
+    except BloggerAPIError as e:
+        print(e)
         return None
-# --- AKHIR FUNGSI get_blogger_posts YANG DIPERBARUI ---
+    finally:
+        client.close()
+# --- AKHIR FUNGSI get_blogger_posts ---